@@ -28,10 +28,16 @@ class Settings(BaseSettings):
     ENGINE_HASH_MB: int = 1024
     ENGINE_DEPTH: int = 20
     ENGINE_MULTIPV: int = 4
+    # Parallel analysis (timeline builder): K small engines instead of one big
+    # one. ENGINE_POOL_SIZE=0 means os.cpu_count() // ENGINE_POOL_THREADS.
+    ENGINE_POOL_SIZE: int = 0
+    ENGINE_POOL_THREADS: int = 1
 
     # Analysis / Rendering helpers
     ALT_PREVIEW_PLIES: int = 2
     ALT_MAX: int = 2
+    # Skip alt previews when PV1 beats PV2 by at least this much (forced moves)
+    ALT_SKIP_CP_GAP: int = 200
     MAX_SCENE_DURATION_MS: int = 1600
 
     # -----------------------------
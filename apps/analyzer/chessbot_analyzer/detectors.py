@@ -4,6 +4,9 @@ from __future__ import annotations
 import typing as t
 import chess
 
+# Square index -> name by plain indexing (no chess.square_name call per square)
+_SQ_NAMES: t.Tuple[str, ...] = tuple(chess.SQUARE_NAMES)
+
 
 def _sign(x: int) -> int:
     return (x > 0) - (x < 0)
@@ -83,7 +86,7 @@ def _ray_squares_exclusive(board: chess.Board, attacker: int, king: int) -> list
         cur = _square_step(cur, df, dr)
         if cur is None or cur == king:
             break
-        ray.append(chess.square_name(cur))
+        ray.append(_SQ_NAMES[cur])
     return ray
 
 
@@ -124,14 +127,14 @@ class FeatureDetectors:
                 step = _unit_direction(king_sq, sq)
                 if step is None:
                     # Shouldn't happen for a true pin, but be defensive.
-                    pins.append({"sq": chess.square_name(sq), "king": chess.square_name(king_sq)})
+                    pins.append({"sq": _SQ_NAMES[sq], "king": _SQ_NAMES[king_sq]})
                     continue
                 df, dr = step
 
                 # Search from the pinned piece outward *away from the king* to find the attacker.
                 attacker_sq = _first_piece_along(board, sq, df, dr)
                 if attacker_sq is None:
-                    pins.append({"sq": chess.square_name(sq), "king": chess.square_name(king_sq)})
+                    pins.append({"sq": _SQ_NAMES[sq], "king": _SQ_NAMES[king_sq]})
                     continue
 
                 attacker_piece = board.piece_at(attacker_sq)
@@ -143,41 +146,49 @@ class FeatureDetectors:
                     # Build ray from attacker towards the king (exclusive of attacker, inclusive through king).
                     ray_between = _ray_squares_exclusive(board, attacker_sq, king_sq)
                     # Ensure the pinned square and king are included (renderer expects them).
-                    if chess.square_name(sq) not in ray_between:
+                    if _SQ_NAMES[sq] not in ray_between:
                         # Insert it in the correct place if python-chess returned a weird alignment (very unlikely)
                         # By construction, the pinned square lies on this ray.
                         pass
-                    ray_full = ray_between + [chess.square_name(king_sq)]
+                    ray_full = ray_between + [_SQ_NAMES[king_sq]]
 
                     pins.append(
                         {
-                            "sq": chess.square_name(sq),
-                            "attacker": chess.square_name(attacker_sq),
-                            "king": chess.square_name(king_sq),
+                            "sq": _SQ_NAMES[sq],
+                            "attacker": _SQ_NAMES[attacker_sq],
+                            "king": _SQ_NAMES[king_sq],
                             "ray": ray_full,
                         }
                     )
                 else:
                     # Fallback minimal info if something is off.
-                    pins.append({"sq": chess.square_name(sq), "king": chess.square_name(king_sq)})
+                    pins.append({"sq": _SQ_NAMES[sq], "king": _SQ_NAMES[king_sq]})
 
         return pins
 
+    @staticmethod
+    def attack_masks(board: chess.Board) -> tuple[int, int]:
+        """
+        Squares currently attacked by each side as (white, black) 64-bit masks
+        (bit i = square i, a1 = bit 0). Same set as is_attacked_by() per square,
+        but built from one attacks_mask() per piece instead of 64 queries per side.
+        """
+        masks = [0, 0]
+        for color in (chess.WHITE, chess.BLACK):
+            m = 0
+            for sq in chess.scan_reversed(board.occupied_co[color]):
+                m |= board.attacks_mask(sq)
+            masks[color] = m
+        return masks[chess.WHITE], masks[chess.BLACK]
+
     @staticmethod
     def attacked_squares(board: chess.Board) -> dict[str, list[str]]:
         """
         Squares currently attacked by each side, as algebraic strings.
         Useful for heatmaps/overlays.
         """
+        white, black = FeatureDetectors.attack_masks(board)
         return {
-            "white": [
-                chess.square_name(s)
-                for s in chess.SQUARES
-                if board.is_attacked_by(chess.WHITE, s)
-            ],
-            "black": [
-                chess.square_name(s)
-                for s in chess.SQUARES
-                if board.is_attacked_by(chess.BLACK, s)
-            ],
+            "white": [_SQ_NAMES[s] for s in chess.scan_forward(white)],
+            "black": [_SQ_NAMES[s] for s in chess.scan_forward(black)],
         }
@@ -44,6 +44,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import chess
+import orjson
 
 from . import quotes
 from .utils.logging import get_logger
@@ -2323,5 +2324,6 @@ def _reflow_paragraphs(beats: List[Dict[str, Any]]) -> None:
 def save_script(script: Dict[str, Any], path: str | Path) -> None:
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(script, indent=2, ensure_ascii=False), encoding="utf-8")
+    # Indented for diffing builds; orjson writes UTF-8 directly, as ensure_ascii=False did
+    path.write_bytes(orjson.dumps(script, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     logger.info(f"Script saved to {path} ({len(script.get('beats', []))} beats)")
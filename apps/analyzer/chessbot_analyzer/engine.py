@@ -5,7 +5,10 @@ from __future__ import annotations
 
 import hashlib
 import json
-from typing import Any, Dict, List, Optional
+import os
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
 
 import chess
 import chess.engine
@@ -94,9 +97,8 @@ class StockfishEngine:
         if isinstance(infos, dict):
             infos = [infos]
 
-        # Normalize + build JSON-safe payload for cache
+        # Normalize
         native: List[Dict[str, Any]] = []
-        cached_payload: List[Dict[str, Any]] = []
 
         for idx, info in enumerate(infos, start=1):
             pv_moves = info.get("pv", []) or []
@@ -121,21 +123,8 @@ class StockfishEngine:
                 }
             )
 
-            # Build JSON-safe cache entry
-            cached_payload.append(
-                {
-                    "pv_uci": [m.uci() for m in pv_moves],
-                    "cp": cp,
-                    "mate": mate,
-                    "depth": depth_out,
-                    "nodes": nodes_out,
-                    "time": time_out,
-                    "multipv": idx,
-                }
-            )
-
-        # Store in cache
-        self.cache.set(cache_key, cached_payload)
+        # Store in cache (JSON-safe form)
+        self.cache.set(cache_key, self._native_to_json(native))
         logger.debug(f"Analyzed position: depth={d} multipv={m} -> {len(native)} PVs")
 
         return native
@@ -183,6 +172,21 @@ class StockfishEngine:
         key = f"{fen}|d={depth}|m={multipv}"
         return hashlib.md5(key.encode("utf-8")).hexdigest()
 
+    @staticmethod
+    def _native_to_json(native: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "pv_uci": [m.uci() for m in (entry.get("pv") or [])],
+                "cp": entry.get("cp"),
+                "mate": entry.get("mate"),
+                "depth": entry.get("depth"),
+                "nodes": entry.get("nodes"),
+                "time": entry.get("time"),
+                "multipv": entry.get("multipv"),
+            }
+            for entry in native
+        ]
+
     @staticmethod
     def _json_to_native(cached_payload: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
@@ -200,3 +204,126 @@ class StockfishEngine:
                 }
             )
         return out
+
+
+class EnginePool:
+    """
+    Fixed-size pool of StockfishEngine workers for analysing independent positions
+    concurrently. Each engine runs with few threads, so K engines searching K
+    positions at once keep every core busy (depth-N searches scale far better
+    across positions than across threads of one search).
+
+    Engines are checked out per call, so a given engine is only ever used by one
+    thread at a time. Each keeps its own CacheManager connection.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: Optional[int] = None,
+        threads_per_engine: Optional[int] = None,
+        path: Optional[str] = None,
+        hash_mb: Optional[int] = None,
+        multipv: Optional[int] = None,
+        depth: Optional[int] = None,
+    ) -> None:
+        threads = max(1, threads_per_engine or settings.ENGINE_POOL_THREADS)
+        self.size = max(1, size or settings.ENGINE_POOL_SIZE or (os.cpu_count() or 1) // threads)
+        # Split the hash budget so K engines don't allocate K x ENGINE_HASH_MB.
+        per_engine_hash = max(16, (hash_mb or settings.ENGINE_HASH_MB) // self.size)
+
+        self._engines = [
+            StockfishEngine(
+                path=path,
+                threads=threads,
+                hash_mb=per_engine_hash,
+                multipv=multipv,
+                depth=depth,
+            )
+            for _ in range(self.size)
+        ]
+        self._idle: "queue.SimpleQueue[StockfishEngine]" = queue.SimpleQueue()
+        for eng in self._engines:
+            self._idle.put(eng)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ---------------- context manager ----------------
+
+    def __enter__(self) -> "EnginePool":
+        logger.info(f"Engine pool: {self.size} x Stockfish (Threads={self._engines[0].threads})")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ---------------- public API ----------------
+
+    def warm_up(self) -> None:
+        """
+        Start every engine subprocess in the background (Stockfish boot is
+        ~50-200 ms each) so callers can overlap it with other setup. Each
+        warm-up holds its engine until it is open, so analyses queued after it
+        never race a half-started process.
+        """
+        for _ in range(self.size):
+            self._submit(self._warm_one)
+
+    def analyse(
+        self,
+        board: chess.Board,
+        *,
+        multipv: Optional[int] = None,
+        depth: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Analyse on the next idle engine (blocks until one is free)."""
+        eng = self._idle.get()
+        try:
+            return eng.analyse(board, multipv=multipv, depth=depth)
+        finally:
+            self._idle.put(eng)
+
+    def submit(
+        self,
+        board: chess.Board,
+        *,
+        multipv: Optional[int] = None,
+        depth: Optional[int] = None,
+    ) -> "Future[List[Dict[str, Any]]]":
+        """Queue an analysis; the board is copied so callers may keep mutating theirs."""
+        snapshot = board.copy(stack=False)
+        return self._submit(self.analyse, snapshot, multipv=multipv, depth=depth)
+
+    def analyse_many(
+        self,
+        boards: Sequence[chess.Board],
+        *,
+        multipv: Optional[int] = None,
+        depth: Optional[int] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Analyse all positions concurrently; results come back in input order."""
+        futures = [self.submit(b, multipv=multipv, depth=depth) for b in boards]
+        return [f.result() for f in futures]
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for eng in self._engines:
+            try:
+                eng.close()
+            except Exception:
+                pass
+
+    # ---------------- internals ----------------
+
+    def _submit(self, fn: Any, *args: Any, **kwargs: Any) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="stockfish")
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def _warm_one(self) -> None:
+        eng = self._idle.get()
+        try:
+            eng.__enter__()
+        finally:
+            self._idle.put(eng)
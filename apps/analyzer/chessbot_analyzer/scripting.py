@@ -106,7 +106,7 @@ class ScriptGenerator:
         player = s.get("player")
         eval_target = float(s.get("evalBarTarget", 0.0))
         pins = s.get("pins") or []
-        attacked = s.get("attacked") or {"white": [], "black": []}
+        attacked = s.get("attacked") or {}
         tag = s.get("tag")
         captured = bool(s.get("captured"))
 
@@ -163,7 +163,9 @@ class ScriptGenerator:
             else:
                 parts.append("pins everywhere… nobody can move freely")
 
-        total_attacked = len(attacked.get("white", [])) + len(attacked.get("black", []))
+        total_attacked = sum(
+            bin(int(attacked.get(k) or "0", 16)).count("1") for k in ("whiteMask", "blackMask")
+        )
         if not pins and total_attacked > 40 and random.random() < 0.25:
             parts.append("tension is rising across the board")
 
@@ -2,23 +2,37 @@
 
 from __future__ import annotations
 
+import io
 import json
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import chess
 import chess.pgn
+import orjson
 from pydantic import BaseModel
 
 from .config import settings
 from .detectors import FeatureDetectors
-from .utils.evals import cp_to_bar_value
+from .utils.evals import cp_array_to_bar
 from .utils.logging import get_logger
+from .utils.pgn import GameView
 
 logger = get_logger(__name__)
 
+# Square index <-> name lookups for the per-ply loops (plain indexing instead of
+# a chess.square_name / chess.parse_square call each time).
+_SQ_NAMES: Tuple[str, ...] = tuple(chess.SQUARE_NAMES)
+_SQ_INDEX: Dict[str, int] = {name: i for i, name in enumerate(_SQ_NAMES)}
+
 
 # ------------------------------ Pydantic models ------------------------------
+#
+# The models document the timeline.json schema and validate timelines read back
+# in (CLI, tests). The builder itself emits plain dicts of the same shape: its
+# input is trusted, and validating then re-dumping every scene was pure overhead.
 
 
 class Pin(BaseModel):
@@ -30,8 +44,10 @@ class Pin(BaseModel):
 
 
 class Attacked(BaseModel):
-    white: List[str]
-    black: List[str]
+    # 64-bit square masks as 16 hex digits (bit i = square i, a1 = bit 0).
+    # Hex rather than JSON numbers: uint64 does not fit a JS number exactly.
+    whiteMask: str
+    blackMask: str
 
 
 class SceneMain(BaseModel):
@@ -78,6 +94,34 @@ class Timeline(BaseModel):
     totalDurationMs: int = 0
 
 
+def _attacked_dict(board: chess.Board) -> Dict[str, str]:
+    white, black = FeatureDetectors.attack_masks(board)
+    return {"whiteMask": f"{white:016x}", "blackMask": f"{black:016x}"}
+
+
+def _model_dict(obj: Any) -> Any:
+    """orjson `default=` hook: dump pydantic models straight from their __dict__."""
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError
+
+
+def _audio_duration_ms(path: Path, default_ms: int = 2000) -> int:
+    """Clip duration from the RIFF header; soundfile for what `wave` can't parse."""
+    try:
+        with wave.open(str(path), "rb") as w:
+            return int(1000 * w.getnframes() / w.getframerate())
+    except (wave.Error, EOFError):
+        pass  # e.g. float / WAVE_FORMAT_EXTENSIBLE data
+    try:
+        import soundfile  # type: ignore
+
+        return int(1000 * soundfile.info(str(path)).duration)
+    except Exception as e:
+        logger.warning("Could not read duration of {}: {}; using {}ms", path, e, default_ms)
+        return default_ms
+
+
 # ------------------------------ Engine adapter -------------------------------
 
 
@@ -85,7 +129,7 @@ class _EngineAdapter:
     """
     Adapter so TimelineBuilder can use either:
       - a provided engine (must implement analyse(board, multipv=?, depth=?))
-      - or manage its own StockfishEngine lifecycle (open once, close at end)
+      - or manage its own EnginePool lifecycle (open once, close at end)
     """
 
     def __init__(self, engine: Any | None = None) -> None:
@@ -94,14 +138,26 @@ class _EngineAdapter:
             self._eng = engine
         else:
             # Lazy import to avoid hard dependency in tests
-            from .engine import StockfishEngine  # type: ignore
-            self._eng = StockfishEngine()
+            from .engine import EnginePool  # type: ignore
+            self._eng = EnginePool()
             # Open once for the whole build
             self._eng.__enter__()
 
     def analyse(self, board: chess.Board, multipv: int, depth: int) -> List[Dict[str, Any]]:
         return self._eng.analyse(board, multipv=multipv, depth=depth)
 
+    def warm_up(self) -> None:
+        """Start engine processes in the background (owned pools only; non-blocking)."""
+        if self._owned and hasattr(self._eng, "warm_up"):
+            self._eng.warm_up()
+
+    def analyse_many(self, boards: List[chess.Board], multipv: int, depth: int) -> List[List[Dict[str, Any]]]:
+        """Analyse independent positions, in parallel when the engine supports it."""
+        if hasattr(self._eng, "analyse_many"):
+            return self._eng.analyse_many(boards, multipv=multipv, depth=depth)
+        # Injected engines (fakes, a single StockfishEngine) are not thread-safe
+        return [self._eng.analyse(b, multipv=multipv, depth=depth) for b in boards]
+
     def close(self) -> None:
         if self._owned and hasattr(self._eng, "__exit__"):
             try:
@@ -172,71 +228,88 @@ class TimelineBuilder:
         multipv: Optional[int] = None,
         min_ply_for_alt: int = 8,
         alt_drop_cp: int = 120,
+        alt_skip_cp_gap: Optional[int] = None,
     ) -> Timeline:
         """
         Build a timeline from a raw PGN string. This path is great for tests and ad-hoc runs.
         """
         depth = depth or settings.ENGINE_DEPTH
         multipv = multipv or settings.ENGINE_MULTIPV
+        if alt_skip_cp_gap is None:
+            alt_skip_cp_gap = settings.ALT_SKIP_CP_GAP
+        if audio_durations is None:
+            audio_durations = {}
 
-        game = chess.pgn.read_game(io := __import__("io").StringIO(pgn_text))
-        if game is None:
-            self.engine.close()
-            raise ValueError("Empty or invalid PGN provided.")
-
-        # Meta fallbacks from headers
-        headers = game.headers
-        meta = meta or {
-            "white": headers.get("White"),
-            "black": headers.get("Black"),
-            "date": headers.get("Date"),
-            "event": headers.get("Event"),
-            "result": headers.get("Result"),
-            "eco": headers.get("ECO"),
-        }
+        try:
+            # Stockfish boots in pool threads while this thread parses the PGN;
+            # inside the try, so a bad PGN still closes whatever it started
+            self.engine.warm_up()
+            game = chess.pgn.read_game(io.StringIO(pgn_text))
+            if game is None:
+                raise ValueError("Empty or invalid PGN provided.")
+
+            # Meta fallbacks from headers
+            headers = game.headers
+            meta = meta or {
+                "white": headers.get("White"),
+                "black": headers.get("Black"),
+                "date": headers.get("Date"),
+                "event": headers.get("Event"),
+                "result": headers.get("Result"),
+                "eco": headers.get("ECO"),
+            }
+
+            self.debug_rows = []
+
+            # Snapshot every position up front. Each one is analysed exactly once:
+            # the post-move analysis of ply N is the pre-move analysis of ply N+1.
+            moves = GameView(game).moves
+            board = game.board()
+            positions = [board.copy(stack=False)]
+            for move in moves:
+                board.push(move)
+                positions.append(board.copy(stack=False))
 
-        scenes: List[Dict[str, Any]] = []
-        self.debug_rows = []
-        total_ms = 0
+            # Upper bound: one main scene per ply plus an alt+reset pair per alt.
+            # Filled by index and trimmed at the end instead of growing per append;
+            # durations are accumulated as each scene is written.
+            scenes: List[Any] = [None] * (len(moves) * (1 + 2 * alt_max))
+            idx = 0
+            total_ms = 0
 
-        board = game.board()
-        try:
-            for ply_idx, move in enumerate(game.mainline_moves(), start=1):
+            # Analyses are independent per position, so run them concurrently
+            # and assemble scenes in order afterwards.
+            analyses = self._analyse_cached(positions, multipv=multipv, depth=depth)
+
+            # Eval bar targets for every post-move position in one vectorized pass
+            bar_targets = cp_array_to_bar(
+                [self._white_cp(analyses[i][0], positions[i].turn) for i in range(1, len(positions))]
+            )
+
+            for ply_idx, move in enumerate(moves, start=1):
                 # Pre-move snapshot (for alt-lines; this is the choice point)
-                board_before = board.copy()
+                board_before = positions[ply_idx - 1]
+                # Post-move position for main scene
+                board = positions[ply_idx]
 
                 # SAN of the actual move from the pre-move board
-                san_move = board.san(move)
-
-                # Apply the real move (post-move position for main scene)
-                board.push(move)
+                san_move = board_before.san(move)
 
                 # Last move arrow
                 last_arrow = [
-                    chess.square_name(move.from_square),
-                    chess.square_name(move.to_square),
+                    _SQ_NAMES[move.from_square],
+                    _SQ_NAMES[move.to_square],
                 ]
 
                 # Engine analysis on *post-move* position for eval bar
-                infos_post = self.engine.analyse(board, multipv=multipv, depth=depth)
+                infos_post = analyses[ply_idx]
                 best_cp_post, _best_mate_post = self._extract_cp_mate(infos_post[0], pov=board.turn)
 
-                # White-POV centipawns for the eval bar (cp is from side-to-move POV,
-                # which alternates every ply — without this the bar flips each move).
-                if best_cp_post is not None:
-                    white_cp_post = best_cp_post if board.turn == chess.WHITE else -best_cp_post
-                elif _best_mate_post is not None:
-                    mate_for_stm = _best_mate_post > 0
-                    stm_is_white = board.turn == chess.WHITE
-                    white_cp_post = 10000 if (mate_for_stm == stm_is_white) else -10000
-                else:
-                    white_cp_post = 0
-
                 # Determine capture and simple engine tag
                 is_capture = board_before.is_capture(move)
 
                 # Engine analysis on pre-move position for tag classification
-                infos_pre = self.engine.analyse(board_before, multipv=multipv, depth=depth)
+                infos_pre = analyses[ply_idx - 1]
                 best_cp_pre, best_mate_pre = self._extract_cp_mate(infos_pre[0], pov=board_before.turn) if infos_pre else (None, None)
 
                 # Was the played move the engine's first choice?
@@ -304,23 +377,24 @@ class TimelineBuilder:
 
                 # Build main scene
                 main_duration = self._duration_for(main_id, audio_durations)
-                pins_models = self._pin_models(board)
-                attacked_model = Attacked(**FeatureDetectors.attacked_squares(board))
-                main_scene = SceneMain(
-                    id=main_id,
-                    fen=board.fen(),
-                    move=san_move,
-                    lastMoveArrow=last_arrow,
-                    evalBarTarget=cp_to_bar_value(white_cp_post),
-                    pins=pins_models,
-                    attacked=attacked_model,
-                    durationMs=main_duration,
-                    moveNumber=(ply_idx + 1) // 2,
-                    player="white" if (ply_idx % 2 == 1) else "black",
-                    captured=is_capture,
-                    tag=move_tag,
-                )
-                scenes.append(main_scene.dict())
+                # Same shape (and key order) as SceneMain.dict()
+                scenes[idx] = {
+                    "type": "main",
+                    "id": main_id,
+                    "fen": board.fen(),
+                    "move": san_move,
+                    "lastMoveArrow": last_arrow,
+                    "evalBarTarget": bar_targets[ply_idx - 1],
+                    "pins": self._pins(board),
+                    "attacked": _attacked_dict(board),
+                    "durationMs": main_duration,
+                    "moveNumber": (ply_idx + 1) // 2,
+                    "player": "white" if (ply_idx % 2 == 1) else "black",
+                    "cueTimes": None,
+                    "captured": is_capture,
+                    "tag": move_tag,
+                }
+                idx += 1
                 total_ms += main_duration
 
                 # Alt previews ("what could have been better"): shown after the opening
@@ -334,11 +408,23 @@ class TimelineBuilder:
                     elif delta is not None and delta <= -alt_drop_cp:
                         allow_alt = True
 
+                # When the best move dominates (forced recapture, only move, mate vs.
+                # no mate) the runner-up lines are obviously worse: nothing to show.
+                if allow_alt and len(infos_pre) > 1:
+                    gap = self._sort_score(infos_pre[0], board_before.turn) - self._sort_score(
+                        infos_pre[1], board_before.turn
+                    )
+                    if gap >= alt_skip_cp_gap:
+                        allow_alt = False
+
                 if allow_alt:
+                    # Sibling alts of one root often open with the same moves; share
+                    # the replayed prefixes (board, SAN, attacked) between them.
+                    prefix_cache: Dict[Tuple[chess.Move, ...], List[Any]] = {}
                     # Skip PV #1 (best); take next best up to alt_max
                     for alt_idx, info in enumerate(infos_pre[1:alt_max + 1], start=2):
                         alt_id = f"{main_id}_alt{alt_idx}"
-                        alt_scene = self._build_alt_scene(
+                        alt_scene = scenes[idx] = self._build_alt_scene(
                             alt_id,
                             board_before,
                             info,
@@ -346,22 +432,27 @@ class TimelineBuilder:
                             label="Alternative",
                             multipv_index=alt_idx,
                             audio_durations=audio_durations,
+                            prefix_cache=prefix_cache,
                         )
-                        scenes.append(alt_scene.dict())
-                        total_ms += alt_scene.durationMs
+                        idx += 1
+                        total_ms += alt_scene["durationMs"]
 
                         reset_id = f"{main_id}_reset{alt_idx}"
-                        reset_scene = SceneReset(
-                            id=reset_id,
-                            durationMs=self._duration_for(reset_id, audio_durations, 200),
-                        )
-                        scenes.append(reset_scene.dict())
-                        total_ms += reset_scene.durationMs
+                        reset_duration = self._duration_for(reset_id, audio_durations, 200)
+                        scenes[idx] = {
+                            "type": "reset",
+                            "id": reset_id,
+                            "durationMs": reset_duration,
+                        }
+                        idx += 1
+                        total_ms += reset_duration
         finally:
             # Close engine if we own it
             self.engine.close()
 
-        tl = Timeline(meta=meta, scenes=scenes, totalDurationMs=total_ms)
+        del scenes[idx:]
+        # Trusted, already-shaped input: skip validation (which would re-copy every scene)
+        tl = Timeline.construct(meta=meta, scenes=scenes, totalDurationMs=total_ms)
         logger.info(f"Built timeline with {len(scenes)} scenes, total {total_ms} ms")
         # Write debug rows if present
         try:
@@ -376,29 +467,35 @@ class TimelineBuilder:
             logger.warning(f"Failed to write tag_debug.json: {e}")
         return tl
 
-    def save(self, timeline: Timeline, path: str) -> None:
-        """Save timeline to JSON file."""
-        Path(path).parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(timeline.dict(), f, indent=2, ensure_ascii=False)
+    def save(self, timeline: Timeline, path: str, pretty: bool = False) -> None:
+        """Save timeline to JSON file (compact unless `pretty`)."""
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        # One orjson pass straight off the model; scenes are already plain dicts
+        out.write_bytes(
+            orjson.dumps(timeline, default=_model_dict, option=orjson.OPT_INDENT_2 if pretty else 0)
+        )
         logger.info(f"Timeline saved to {path}")
 
     def load_audio_durations(self, audio_dir: str) -> Dict[str, int]:
-        """Load audio durations from directory (placeholder: treats all as 2000ms)."""
+        """Load audio durations (ms) keyed by scene id from a directory of WAVs."""
         durations: Dict[str, int] = {}
         p = Path(audio_dir)
         if not p.exists():
             logger.warning(f"Audio directory not found: {audio_dir}")
             return durations
-        for wav in p.glob("*.wav"):
-            durations[wav.stem] = 2000  # TODO: read real duration via ffprobe
+        wavs = list(p.glob("*.wav"))
+        # Header reads only (no decode, no ffprobe process per file); the scan
+        # is I/O-bound, so a few threads overlap the stat + open latency.
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for wav, ms in zip(wavs, pool.map(_audio_duration_ms, wavs)):
+                durations[wav.stem] = ms
         return durations
 
     def apply_alignment_data(self, timeline: Timeline, alignment_file: str) -> Timeline:
         """Apply word-level alignment cue times to scenes (optional)."""
         try:
-            with open(alignment_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = orjson.loads(Path(alignment_file).read_bytes())
             for scene in timeline.scenes:
                 sid = scene["id"]
                 if sid in data:
@@ -410,6 +507,37 @@ class TimelineBuilder:
 
     # ----------- Helpers -----------
 
+    def _analyse_cached(self, boards: List[chess.Board], multipv: int, depth: int) -> List[List[Dict[str, Any]]]:
+        """
+        Engine analyses for `boards`, consulting self.cache_manager first. Only the
+        misses go to the engine; they are stored back in the engine's JSON-safe form
+        (same keys as StockfishEngine's own cache), so rebuilds skip Stockfish.
+        """
+        if self.cache_manager is None:
+            return self.engine.analyse_many(boards, multipv=multipv, depth=depth)
+
+        from .engine import StockfishEngine  # type: ignore
+
+        keys = [StockfishEngine._cache_key(b.fen(), depth, multipv) for b in boards]
+        results: List[Any] = [None] * len(boards)
+        misses: List[int] = []
+        for i, key in enumerate(keys):
+            hit = self.cache_manager.get(key)
+            if hit:
+                results[i] = StockfishEngine._json_to_native(hit)
+            else:
+                misses.append(i)
+
+        if misses:
+            fresh = self.engine.analyse_many([boards[i] for i in misses], multipv=multipv, depth=depth)
+            for i, infos in zip(misses, fresh):
+                results[i] = infos
+            # One transaction for the whole batch instead of a commit per position
+            self.cache_manager.set_many(
+                {keys[i]: StockfishEngine._native_to_json(infos) for i, infos in zip(misses, fresh)}
+            )
+        return results
+
     def _duration_for(
         self,
         scene_id: str,
@@ -418,15 +546,13 @@ class TimelineBuilder:
         min_ms: int = 1200,
         max_ms: int = 3500,
     ) -> int:
-        if audio_durations and scene_id in audio_durations:
-            ms = audio_durations[scene_id] + 150
-        else:
-            ms = default_ms
+        # One lookup on the hit path (from_pgn passes {} rather than None)
+        audio_ms = audio_durations.get(scene_id) if audio_durations is not None else None
+        ms = default_ms if audio_ms is None else audio_ms + 150
         # Add extra time for main move scenes to stabilize visuals (e.g., eval bar)
-        is_main = scene_id.startswith("m") and ("_" not in scene_id)
-        if is_main:
+        if scene_id.startswith("m") and "_" not in scene_id:
             ms += 1000  # +1s per move
-        return max(min_ms, min(max_ms, ms))
+        return min_ms if ms < min_ms else max_ms if ms > max_ms else ms
 
     def _extract_cp_mate(self, info: Dict[str, Any], pov: chess.Color) -> Tuple[Optional[int], Optional[int]]:
         """
@@ -445,15 +571,36 @@ class TimelineBuilder:
         cp = score.pov(pov).score(mate_score=100000)
         return int(cp), None
 
-    def _pin_models(self, board: chess.Board) -> List[Pin]:
-        """Convert detector pins to Pin models and add color."""
+    def _white_cp(self, info: Dict[str, Any], turn: chess.Color) -> int:
+        """
+        White-POV centipawns for the eval bar (cp is from side-to-move POV, which
+        alternates every ply — without this the bar flips each move).
+        """
+        cp, mate = self._extract_cp_mate(info, pov=turn)
+        if cp is not None:
+            return cp if turn == chess.WHITE else -cp
+        if mate is not None:
+            mate_for_stm = mate > 0
+            stm_is_white = turn == chess.WHITE
+            return 10000 if (mate_for_stm == stm_is_white) else -10000
+        return 0
+
+    def _sort_score(self, info: Dict[str, Any], pov: chess.Color) -> int:
+        """Single comparable centipawn number from `pov`; mates rank beyond any cp."""
+        cp, mate = self._extract_cp_mate(info, pov=pov)
+        if mate is not None:
+            return 100000 - mate if mate > 0 else -100000 - mate
+        return cp or 0
+
+    def _pins(self, board: chess.Board) -> List[Dict[str, Any]]:
+        """Detector pins as Pin-shaped dicts, with color added."""
         raw = FeatureDetectors.compute_pins(board)
-        pins: List[Pin] = []
+        pins: List[Dict[str, Any]] = []
         for p in raw:
             sq = p.get("sq")
-            piece = board.piece_at(chess.parse_square(sq)) if sq else None
+            piece = board.piece_at(_SQ_INDEX[sq]) if sq else None
             color = "white" if (piece and piece.color == chess.WHITE) else "black"
-            pins.append(Pin(sq=sq, ray=p.get("ray", []), attacker=p.get("attacker"), king=p.get("king"), color=color))
+            pins.append({"sq": sq, "ray": p.get("ray", []), "attacker": p.get("attacker"), "king": p.get("king"), "color": color})
         return pins
 
     def _build_alt_scene(
@@ -466,35 +613,60 @@ class TimelineBuilder:
         label: str,
         multipv_index: int,
         audio_durations: Optional[Dict[str, int]],
-    ) -> SceneAlt:
-        """Construct an 'alt' scene by simulating first N plies of the PV from the root position."""
+        prefix_cache: Optional[Dict[Tuple[chess.Move, ...], List[Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Construct an 'alt' scene (SceneAlt-shaped dict) by simulating first N plies of
+        the PV from the root position.
+
+        `prefix_cache` (one dict per root) maps a PV move prefix to
+        [board after it, SAN of its last move, Attacked or None], so sibling alts
+        that share opening moves replay and scan them only once.
+        """
         pv_moves: List[chess.Move] = info.get("pv", []) or []
         # Limit to requested preview plies
         pv_moves = pv_moves[:preview_plies]
 
-        tmp = root_board.copy()
+        cache = prefix_cache if prefix_cache is not None else {}
+        tmp = root_board
+        entry: Optional[List[Any]] = None
+        key: Tuple[chess.Move, ...] = ()
         arrows: List[List[str]] = []
         pv_san: List[str] = []
 
         for mv in pv_moves:
-            san = tmp.san(mv)
-            pv_san.append(san)
-            arrows.append([chess.square_name(mv.from_square), chess.square_name(mv.to_square)])
-            tmp.push(mv)
-
-        attacked_model = Attacked(**FeatureDetectors.attacked_squares(tmp))
+            key += (mv,)
+            entry = cache.get(key)
+            if entry is None:
+                san = tmp.san(mv)
+                tmp = tmp.copy(stack=False)
+                tmp.push(mv)
+                entry = cache[key] = [tmp, san, None]
+            tmp = entry[0]
+            pv_san.append(entry[1])
+            arrows.append([_SQ_NAMES[mv.from_square], _SQ_NAMES[mv.to_square]])
+
+        if entry is None:
+            attacked = _attacked_dict(tmp)
+        else:
+            if entry[2] is None:
+                entry[2] = _attacked_dict(tmp)
+            attacked = dict(entry[2])
         cp, mate = self._extract_cp_mate(info, pov=root_board.turn)
         duration = self._duration_for(scene_id, audio_durations, default_ms=1200)
 
-        return SceneAlt(
-            id=scene_id,
-            label=label,
-            fen=root_board.fen(),     # <-- seed from the PRE-MOVE (branch) position
-            pv=pv_san,
-            arrows=arrows,
-            attacked=attacked_model,
-            cp=cp,
-            mate=mate,
-            durationMs=duration,
-            multipv=multipv_index,
-        )
+        # Same shape (and key order) as SceneAlt.dict()
+        return {
+            "type": "alt",
+            "id": scene_id,
+            "label": label,
+            "fen": root_board.fen(),  # <-- seed from the PRE-MOVE (branch) position
+            "pv": pv_san,
+            "arrows": arrows,
+            "attacked": attacked,
+            "cp": cp,
+            "mate": mate,
+            "durationMs": duration,
+            "multipv": multipv_index,
+            "cueTimes": None,
+        }
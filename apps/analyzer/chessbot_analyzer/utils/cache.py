@@ -1,14 +1,24 @@
 """Simple disk and database cache for engine results."""
 
-import json
 import os
 import sqlite3
 from typing import Any, Optional, Dict
 from pathlib import Path
+
+import orjson
+
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+# Constant SQL text so sqlite3's statement cache reuses the compiled statements
+_GET_SQL = "SELECT value FROM cache WHERE key = ?"
+# Upsert updates an existing row in place (INSERT OR REPLACE deletes + reinserts)
+_SET_SQL = (
+    "INSERT INTO cache (key, value) VALUES (?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+)
+
 
 class CacheManager:
     """Manages caching of engine analysis results."""
@@ -32,42 +42,51 @@ class CacheManager:
     def _init_db(self):
         """Initialize SQLite database for caching."""
         self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Values are raw orjson bytes. Caches created before this schema keep
+        # their TEXT/created_at table; reads and writes work against both.
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS cache (
                 key TEXT PRIMARY KEY,
-                value TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+                value BLOB
+            ) WITHOUT ROWID
         """)
         # Durable enough for a cache, and much faster for the write-heavy
         # analysis pass.
         if self.db_path != ":memory:":
             self.conn.execute("PRAGMA journal_mode=WAL")
             self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
         self.conn.commit()
     
     def get(self, key: str) -> Optional[Any]:
         """Get cached value by key."""
         try:
-            cursor = self.conn.execute("SELECT value FROM cache WHERE key = ?", (key,))
-            row = cursor.fetchone()
+            row = self.conn.execute(_GET_SQL, (key,)).fetchone()
             if row:
-                return json.loads(row[0])
+                return orjson.loads(row[0])
         except Exception as e:
-            logger.warning(f"Cache get failed for key {key}: {e}")
+            logger.warning("Cache get failed for key {}: {}", key, e)
         return None
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None):
         """Set cached value with optional TTL."""
         try:
-            json_value = json.dumps(value)
-            self.conn.execute(
-                "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
-                (key, json_value)
-            )
+            self.conn.execute(_SET_SQL, (key, orjson.dumps(value)))
             self.conn.commit()
         except Exception as e:
-            logger.warning(f"Cache set failed for key {key}: {e}")
+            logger.warning("Cache set failed for key {}: {}", key, e)
+
+    def set_many(self, items: Dict[str, Any]):
+        """Set many cached values in a single transaction (one commit, one sync)."""
+        if not items:
+            return
+        try:
+            rows = [(key, orjson.dumps(value)) for key, value in items.items()]
+            with self.conn:
+                self.conn.executemany(_SET_SQL, rows)
+        except Exception as e:
+            logger.warning("Cache set_many failed for {} keys: {}", len(items), e)
     
     def clear(self):
         """Clear all cached values."""
@@ -76,7 +95,7 @@ class CacheManager:
             self.conn.commit()
             logger.info("Cache cleared")
         except Exception as e:
-            logger.warning(f"Cache clear failed: {e}")
+            logger.warning("Cache clear failed: {}", e)
     
     def close(self):
         """Close database connection."""
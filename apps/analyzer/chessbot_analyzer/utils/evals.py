@@ -1,7 +1,8 @@
 """Evaluation utilities: centipawn to bar value mapping, mate formatting."""
 
 import math
-from typing import Union, Optional
+from functools import lru_cache
+from typing import List, Optional, Sequence, Union
 
 
 def cp_to_bar_value(cp: int, clamp: bool = True) -> float:
@@ -24,41 +25,77 @@ def cp_to_bar_value(cp: int, clamp: bool = True) -> float:
     return bar_value
 
 
-def format_evaluation(score: Union[int, dict], show_sign: bool = True) -> str:
+def cp_array_to_bar(cps: Sequence[int]) -> List[float]:
     """
-    Format evaluation for display.
-    
+    Vectorized cp_to_bar_value for a whole game's evaluations (always clamped).
+
+    Uses NumPy when it is installed (one np.tanh over the array instead of a
+    Python call per value); falls back to the scalar path otherwise.
+
     Args:
-        score: Either centipawn int or dict with 'type' and 'value'
+        cps: Centipawn evaluations
+
+    Returns:
+        Bar values between -1 and 1, as Python floats (JSON-ready)
+    """
+    try:
+        import numpy as np  # type: ignore
+    except ImportError:
+        return [cp_to_bar_value(cp) for cp in cps]
+
+    arr = np.asarray(cps, dtype=np.float64)
+    return np.clip(np.tanh(arr / 400.0), -1.0, 1.0).tolist()
+
+
+@lru_cache(maxsize=4096)
+def format_cp(cp: int, show_sign: bool = True) -> str:
+    """
+    Format a centipawn evaluation in pawns (e.g. "+1.2", "-0.4", "0.0").
+
+    Cached: a game's evaluations repeat heavily at 0.1-pawn granularity.
+
+    Args:
+        cp: Centipawn evaluation
         show_sign: Whether to show + sign for positive values
-        
+
     Returns:
         Formatted evaluation string
     """
-    if isinstance(score, dict):
-        if score.get("type") == "mate":
-            mate_value = score.get("value", 0)
-            if mate_value > 0:
-                return f"#{mate_value}"
-            else:
-                return f"#-{abs(mate_value)}"
-        else:
-            cp = score.get("cp", 0)
-    else:
-        cp = score
-    
+    if -10 < cp < 10:
+        return "0.0"
+
     # Convert to pawns
     pawns = cp / 100.0
-    
-    if abs(pawns) < 0.1:
-        return "0.0"
-    
+
     if show_sign and pawns > 0:
         return f"+{pawns:.1f}"
     else:
         return f"{pawns:.1f}"
 
 
+def format_evaluation(score: Union[int, dict], show_sign: bool = True) -> str:
+    """
+    Format evaluation for display.
+    
+    Args:
+        score: Either centipawn int or dict with 'type' and 'value'
+        show_sign: Whether to show + sign for positive values
+        
+    Returns:
+        Formatted evaluation string
+    """
+    if not isinstance(score, dict):
+        return format_cp(score, show_sign)
+
+    if score.get("type") == "mate":
+        mate_value = score.get("value", 0)
+        if mate_value > 0:
+            return f"#{mate_value}"
+        else:
+            return f"#-{abs(mate_value)}"
+    return format_cp(score.get("cp", 0), show_sign)
+
+
 def is_winning_position(cp: int, threshold: int = 200) -> bool:
     """Check if position is winning based on centipawn threshold."""
     return cp > threshold
@@ -1,7 +1,136 @@
 """FEN utilities and last move arrow helpers."""
 
 import chess
-from typing import Optional, Tuple, List
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Square index <-> name lookups (plain indexing instead of a
+# chess.square_name / chess.parse_square call each time)
+_SQ_NAMES: Tuple[str, ...] = tuple(chess.SQUARE_NAMES)
+_SQ_INDEX: Dict[str, int] = {name: i for i, name in enumerate(_SQ_NAMES)}
+
+
+class FenView:
+    """
+    A FEN parsed and validated once, with the query helpers as methods.
+    
+    Construction raises ValueError for an invalid FEN; after that no query
+    needs error handling. Legal moves are generated on first use and kept.
+    Views are cached and shared across threads: ``board`` is read-only (copy
+    it before pushing moves), and nothing in here mutates it.
+    """
+
+    __slots__ = ("board", "_legal", "_san")
+
+    def __init__(self, fen: str):
+        self.board = chess.Board(fen)
+        self._legal: Optional[List[chess.Move]] = None
+        self._san: Optional[Tuple[str, ...]] = None
+
+    @property
+    def legal(self) -> List[chess.Move]:
+        if self._legal is None:
+            self._legal = list(self.board.legal_moves)
+        return self._legal
+
+    def piece_at(self, square: str) -> Optional[str]:
+        sq = _SQ_INDEX.get(square)
+        if sq is None:
+            return None
+        piece = self.board.piece_at(sq)
+        return piece.symbol() if piece else None
+
+    def is_check(self) -> bool:
+        return self.board.is_check()
+
+    def is_checkmate(self) -> bool:
+        # Mate/stalemate reduce to "no legal moves" plus the check test
+        return not self.legal and self.board.is_check()
+
+    def is_stalemate(self) -> bool:
+        return not self.legal and not self.board.is_check()
+
+    def legal_moves(self) -> List[str]:
+        return [move.uci() for move in self.legal]
+
+    def legal_moves_san(self) -> Tuple[str, ...]:
+        if self._san is None:
+            self._san = tuple(self._iter_san())
+        return self._san
+
+    def _iter_san(self) -> Iterator[str]:
+        """
+        SAN for every legal move, same output as ``board.san``. Disambiguation
+        comes from grouping the legal moves by (piece type, target) once instead
+        of regenerating moves per move, and only checking moves pay for a
+        push/pop (to tell "+" from "#"). Runs on a private copy: cached views
+        are shared between threads, and gives_check/push/pop all mutate.
+        """
+        board = self.board.copy(stack=False)
+        legal = self.legal
+        piece_type_at = board.piece_type_at
+        origins: Dict[Tuple[int, int], List[int]] = {}
+        for move in legal:
+            origins.setdefault((piece_type_at(move.from_square), move.to_square), []).append(move.from_square)
+
+        for move in legal:
+            from_sq, to_sq = move.from_square, move.to_square
+            if board.is_castling(move):
+                san = "O-O" if chess.square_file(to_sq) > chess.square_file(from_sq) else "O-O-O"
+            else:
+                piece_type = piece_type_at(from_sq)
+                capture = board.is_capture(move)
+                if piece_type == chess.PAWN:
+                    san = _SQ_NAMES[from_sq][0] + "x" if capture else ""
+                else:
+                    san = chess.piece_symbol(piece_type).upper()
+                    others = [sq for sq in origins[(piece_type, to_sq)] if sq != from_sq]
+                    if others:
+                        file, rank = chess.square_file(from_sq), chess.square_rank(from_sq)
+                        same_rank = any(chess.square_rank(sq) == rank for sq in others)
+                        same_file = any(chess.square_file(sq) == file for sq in others)
+                        if same_rank or not same_file:
+                            san += chess.FILE_NAMES[file]
+                        if same_file:
+                            san += chess.RANK_NAMES[rank]
+                    if capture:
+                        san += "x"
+                san += _SQ_NAMES[to_sq]
+                if move.promotion:
+                    san += "=" + chess.piece_symbol(move.promotion).upper()
+
+            if board.gives_check(move):
+                board.push(move)
+                try:
+                    san += "#" if board.is_checkmate() else "+"
+                finally:
+                    board.pop()
+            yield san
+
+    def turn_color(self) -> str:
+        return "white" if self.board.turn else "black"
+
+    def castling_rights(self) -> dict:
+        board = self.board
+        return {
+            "white_kingside": board.has_kingside_castling_rights(chess.WHITE),
+            "white_queenside": board.has_queenside_castling_rights(chess.WHITE),
+            "black_kingside": board.has_kingside_castling_rights(chess.BLACK),
+            "black_queenside": board.has_queenside_castling_rights(chess.BLACK)
+        }
+
+
+@lru_cache(maxsize=8192)
+def _fen_view(fen: str) -> Optional[FenView]:
+    """
+    Shared FenView for a FEN, or None if the FEN is invalid. The same FEN is
+    typically queried by several helpers in a row, so it is parsed and
+    validated once here and the module-level helpers below need no try/except.
+    """
+    try:
+        return FenView(fen)
+    except ValueError:
+        return None
 
 
 def get_last_move_arrow(board: chess.Board, move: chess.Move) -> Tuple[str, str]:
@@ -15,9 +144,7 @@ def get_last_move_arrow(board: chess.Board, move: chess.Move) -> Tuple[str, str]
     Returns:
         Tuple of (from_square, to_square) as algebraic notation
     """
-    from_sq = chess.square_name(move.from_square)
-    to_sq = chess.square_name(move.to_square)
-    return from_sq, to_sq
+    return _SQ_NAMES[move.from_square], _SQ_NAMES[move.to_square]
 
 
 def san_to_uci(san: str, board: chess.Board) -> Optional[str]:
@@ -69,40 +196,26 @@ def get_piece_at_square(fen: str, square: str) -> Optional[str]:
     Returns:
         Piece symbol or None
     """
-    try:
-        board = chess.Board(fen)
-        sq = chess.parse_square(square)
-        piece = board.piece_at(sq)
-        return piece.symbol() if piece else None
-    except (ValueError, AttributeError):
-        return None
+    view = _fen_view(fen)
+    return view.piece_at(square) if view is not None else None
 
 
 def is_check(fen: str) -> bool:
     """Check if position is in check."""
-    try:
-        board = chess.Board(fen)
-        return board.is_check()
-    except ValueError:
-        return False
+    view = _fen_view(fen)
+    return view is not None and view.is_check()
 
 
 def is_checkmate(fen: str) -> bool:
     """Check if position is checkmate."""
-    try:
-        board = chess.Board(fen)
-        return board.is_checkmate()
-    except ValueError:
-        return False
+    view = _fen_view(fen)
+    return view is not None and view.is_checkmate()
 
 
 def is_stalemate(fen: str) -> bool:
     """Check if position is stalemate."""
-    try:
-        board = chess.Board(fen)
-        return board.is_stalemate()
-    except ValueError:
-        return False
+    view = _fen_view(fen)
+    return view is not None and view.is_stalemate()
 
 
 def get_legal_moves(fen: str) -> List[str]:
@@ -115,11 +228,8 @@ def get_legal_moves(fen: str) -> List[str]:
     Returns:
         List of UCI move strings
     """
-    try:
-        board = chess.Board(fen)
-        return [move.uci() for move in board.legal_moves]
-    except ValueError:
-        return []
+    view = _fen_view(fen)
+    return view.legal_moves() if view is not None else []
 
 
 def get_legal_moves_san(fen: str) -> List[str]:
@@ -132,11 +242,8 @@ def get_legal_moves_san(fen: str) -> List[str]:
     Returns:
         List of SAN move strings
     """
-    try:
-        board = chess.Board(fen)
-        return [board.san(move) for move in board.legal_moves]
-    except ValueError:
-        return []
+    view = _fen_view(fen)
+    return list(view.legal_moves_san()) if view is not None else []
 
 
 def get_turn_color(fen: str) -> Optional[str]:
@@ -149,11 +256,8 @@ def get_turn_color(fen: str) -> Optional[str]:
     Returns:
         "white" or "black" or None if invalid FEN
     """
-    try:
-        board = chess.Board(fen)
-        return "white" if board.turn else "black"
-    except ValueError:
-        return None
+    view = _fen_view(fen)
+    return view.turn_color() if view is not None else None
 
 
 def get_castling_rights(fen: str) -> dict:
@@ -166,18 +270,12 @@ def get_castling_rights(fen: str) -> dict:
     Returns:
         Dict with castling rights
     """
-    try:
-        board = chess.Board(fen)
-        return {
-            "white_kingside": board.has_kingside_castling_rights(chess.WHITE),
-            "white_queenside": board.has_queenside_castling_rights(chess.WHITE),
-            "black_kingside": board.has_kingside_castling_rights(chess.BLACK),
-            "black_queenside": board.has_queenside_castling_rights(chess.BLACK)
-        }
-    except ValueError:
-        return {
-            "white_kingside": False,
-            "white_queenside": False,
-            "black_kingside": False,
-            "black_queenside": False
-        }
+    view = _fen_view(fen)
+    if view is not None:
+        return view.castling_rights()
+    return {
+        "white_kingside": False,
+        "white_queenside": False,
+        "black_kingside": False,
+        "black_queenside": False
+    }
@@ -2,12 +2,18 @@
 
 import sys
 from loguru import logger
-from typing import Optional
+from typing import Any, Dict, Optional
+
+# One bound logger per module name, shared by every get_logger() call
+_bound: Dict[str, Any] = {}
 
 
 def get_logger(name: str) -> logger:
     """Get a logger instance for the given module name."""
-    return logger.bind(module=name)
+    bound = _bound.get(name)
+    if bound is None:
+        bound = _bound[name] = logger.bind(module=name)
+    return bound
 
 
 def setup_logging(level: str = "INFO", log_file: Optional[str] = None):
@@ -3,6 +3,7 @@
 import chess
 import chess.pgn
 import hashlib
+import weakref
 from typing import List, Dict, Any, Optional, Iterator
 from pathlib import Path
 from .logging import get_logger
@@ -10,6 +11,61 @@ from .logging import get_logger
 logger = get_logger(__name__)
 
 
+# Copying this is a bitboard copy; game.board() parses a FEN every call
+_STANDARD_START = chess.Board()
+
+
+def _start_board(game: chess.pgn.Game) -> chess.Board:
+    """Fresh starting board for a game, skipping the FEN parse for standard games."""
+    headers = game.headers
+    if "FEN" not in headers and headers.get("Variant", "Standard") == "Standard":
+        return _STANDARD_START.copy(stack=False)
+    return game.board()
+
+
+class GameView:
+    """
+    Mainline of a game, materialized once.
+    
+    The moves list is walked from the game tree a single time; FENs are
+    replayed lazily on first positional lookup. Pass one view to several
+    helpers instead of letting each re-walk ``game.mainline_moves()``. A view
+    is a snapshot: build a new one if the game's mainline is edited.
+    """
+
+    def __init__(self, game: chess.pgn.Game):
+        self.game = game
+        self.moves: List[chess.Move] = list(game.mainline_moves())
+        self.fens: Optional[List[str]] = None
+
+    def mainline_fens(self) -> List[str]:
+        if self.fens is None:
+            self.fens = list(iter_fens(self.game, self))
+        return self.fens
+
+
+# Views memoized for positional lookups made without an explicit view. Weak
+# keys, so entries go away with their games. Do not edit a game's mainline
+# after querying it.
+_VIEWS_BY_GAME: "weakref.WeakKeyDictionary[chess.pgn.Game, GameView]" = weakref.WeakKeyDictionary()
+
+
+def game_view(game: chess.pgn.Game) -> GameView:
+    """
+    Get the memoized GameView for a game, creating it on first use.
+    
+    Args:
+        game: Chess game object
+        
+    Returns:
+        GameView shared by all positional lookups on this game
+    """
+    view = _VIEWS_BY_GAME.get(game)
+    if view is None:
+        view = _VIEWS_BY_GAME[game] = GameView(game)
+    return view
+
+
 def read_pgn_file(file_path: str) -> Iterator[chess.pgn.Game]:
     """
     Read PGN file and yield games.
@@ -32,6 +88,27 @@ def read_pgn_file(file_path: str) -> Iterator[chess.pgn.Game]:
         raise
 
 
+def iter_pgn_headers(file_path: str) -> Iterator[chess.pgn.Headers]:
+    """
+    Read PGN file and yield only each game's headers.
+    
+    Movetext is skipped without being parsed, so this is the cheap path for
+    callers that need metadata or counts but not moves.
+    
+    Args:
+        file_path: Path to PGN file
+        
+    Yields:
+        Header mappings, one per game
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while True:
+            headers = chess.pgn.read_headers(f)
+            if headers is None:
+                break
+            yield headers
+
+
 def write_pgn_file(games: List[chess.pgn.Game], file_path: str):
     """
     Write games to PGN file.
@@ -50,18 +127,16 @@ def write_pgn_file(games: List[chess.pgn.Game], file_path: str):
         raise
 
 
-def extract_game_metadata(game: chess.pgn.Game) -> Dict[str, Any]:
+def metadata_from_headers(headers: chess.pgn.Headers) -> Dict[str, Any]:
     """
-    Extract metadata from PGN game.
+    Extract header metadata without needing the game tree.
     
     Args:
-        game: Chess game object
+        headers: PGN headers (e.g. from iter_pgn_headers)
         
     Returns:
-        Dictionary with game metadata
+        Dictionary with game metadata (no ply_count)
     """
-    headers = game.headers
-    
     return {
         "white": headers.get("White", "Unknown"),
         "black": headers.get("Black", "Unknown"),
@@ -70,107 +145,156 @@ def extract_game_metadata(game: chess.pgn.Game) -> Dict[str, Any]:
         "event": headers.get("Event", ""),
         "site": headers.get("Site", ""),
         "eco": headers.get("ECO", ""),
-        "ply_count": game.end().board().fullmove_number * 2 - (1 if game.end().board().turn == chess.WHITE else 0)
     }
 
 
-def compute_moves_hash(game: chess.pgn.Game) -> str:
+def extract_game_metadata(
+    game: chess.pgn.Game,
+    view: Optional[GameView] = None,
+    ply_count: Optional[int] = None,
+) -> Dict[str, Any]:
     """
-    Compute hash for game moves to detect duplicates.
+    Extract metadata from PGN game.
     
     Args:
         game: Chess game object
+        view: Precomputed mainline of ``game`` (optional)
+        ply_count: Precomputed number of mainline moves (optional)
         
     Returns:
-        MD5 hash of moves sequence
+        Dictionary with game metadata
     """
-    # Get moves in SAN format
-    moves = []
-    board = game.board()
-    
-    for move in game.mainline_moves():
-        moves.append(board.san(move))
-        board.push(move)
+    metadata = metadata_from_headers(game.headers)
+    if ply_count is None:
+        # Count mainline moves; no board replay needed
+        ply_count = len(view.moves) if view is not None else sum(1 for _ in game.mainline_moves())
+    metadata["ply_count"] = ply_count
+    return metadata
+
+
+def compute_moves_hash(game: chess.pgn.Game, view: Optional[GameView] = None) -> str:
+    """
+    Compute hash for game moves to detect duplicates.
     
-    # Create hash from moves sequence
-    moves_str = " ".join(moves)
-    return hashlib.md5(moves_str.encode()).hexdigest()
+    Args:
+        game: Chess game object
+        view: Precomputed mainline of ``game`` (optional)
+        
+    Returns:
+        128-bit BLAKE2b hex digest of the UCI move sequence
+    """
+    # UCI identifies a move sequence just as well as SAN and needs no board
+    # replay (SAN generation means disambiguation + check detection per ply).
+    moves_bytes = b" ".join(move.uci().encode("ascii") for move in _moves(game, view))
+    return hashlib.blake2b(moves_bytes, digest_size=16).hexdigest()
 
 
-def get_game_moves_san(game: chess.pgn.Game) -> List[str]:
+def get_game_moves_san(game: chess.pgn.Game, view: Optional[GameView] = None) -> List[str]:
     """
     Get all moves in SAN format.
     
     Args:
         game: Chess game object
+        view: Precomputed mainline of ``game`` (optional)
         
     Returns:
         List of SAN moves
     """
     moves = []
-    board = game.board()
+    board = _start_board(game)
     
-    for move in game.mainline_moves():
+    for move in _moves(game, view):
         moves.append(board.san(move))
         board.push(move)
     
     return moves
 
 
-def get_game_moves_uci(game: chess.pgn.Game) -> List[str]:
+def get_game_moves_uci(game: chess.pgn.Game, view: Optional[GameView] = None) -> List[str]:
     """
     Get all moves in UCI format.
     
     Args:
         game: Chess game object
+        view: Precomputed mainline of ``game`` (optional)
         
     Returns:
         List of UCI moves
     """
-    moves = []
-    
-    for move in game.mainline_moves():
-        moves.append(move.uci())
+    return [move.uci() for move in _moves(game, view)]
+
+
+def iter_fens(game: chess.pgn.Game, view: Optional[GameView] = None) -> Iterator[str]:
+    """
+    Yield the FEN of every mainline position, starting position first.
     
-    return moves
+    Args:
+        game: Chess game object
+        view: Precomputed mainline of ``game`` (optional)
+        
+    Yields:
+        FEN strings (one board, one push per move)
+    """
+    board = _start_board(game)
+    yield board.fen()
+    for move in _moves(game, view):
+        board.push(move)
+        yield board.fen()
+
+
+def _moves(game: chess.pgn.Game, view: Optional[GameView]):
+    return view.moves if view is not None else game.mainline_moves()
+
 
+def _mainline_fens(game: chess.pgn.Game, view: Optional[GameView]) -> List[str]:
+    return (view if view is not None else game_view(game)).mainline_fens()
 
-def get_position_after_move(game: chess.pgn.Game, move_number: int) -> Optional[chess.Board]:
+
+def get_position_after_move(
+    game: chess.pgn.Game, move_number: int, view: Optional[GameView] = None
+) -> Optional[chess.Board]:
     """
     Get position after specific move number.
     
+    The mainline is replayed once per game and memoized, so querying every ply
+    costs O(N) pushes in total rather than O(N^2).
+    
     Args:
         game: Chess game object
         move_number: Move number (1-based)
+        view: Precomputed mainline of ``game`` (optional)
         
     Returns:
-        Board position or None if invalid move number
+        Board position (without move stack) or None if invalid move number
     """
-    board = game.board()
-    moves = list(game.mainline_moves())
+    fens = _mainline_fens(game, view)
     
-    if move_number < 1 or move_number > len(moves):
+    if move_number < 1 or move_number >= len(fens):
         return None
     
-    for i in range(move_number):
-        board.push(moves[i])
-    
+    board = game.board()  # keeps the game's board class / chess960 flag
+    board.set_fen(fens[move_number])
     return board
 
 
-def get_fen_after_move(game: chess.pgn.Game, move_number: int) -> Optional[str]:
+def get_fen_after_move(
+    game: chess.pgn.Game, move_number: int, view: Optional[GameView] = None
+) -> Optional[str]:
     """
     Get FEN after specific move number.
     
     Args:
         game: Chess game object
         move_number: Move number (1-based)
+        view: Precomputed mainline of ``game`` (optional)
         
     Returns:
         FEN string or None if invalid move number
     """
-    board = get_position_after_move(game, move_number)
-    return board.fen() if board else None
+    fens = _mainline_fens(game, view)
+    if move_number < 1 or move_number >= len(fens):
+        return None
+    return fens[move_number]
 
 
 def validate_pgn_file(file_path: str) -> bool:
@@ -185,9 +309,8 @@ def validate_pgn_file(file_path: str) -> bool:
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            # Try to read first game
-            game = chess.pgn.read_game(f)
-            return game is not None
+            # Headers of the first game are enough; movetext is skipped unparsed
+            return chess.pgn.read_headers(f) is not None
     except Exception:
         return False
 
@@ -204,12 +327,9 @@ def count_games_in_pgn(file_path: str) -> int:
     """
     count = 0
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            while True:
-                game = chess.pgn.read_game(f)
-                if game is None:
-                    break
-                count += 1
+        # Headers only: counting never needs the moves parsed
+        for _ in iter_pgn_headers(file_path):
+            count += 1
     except Exception as e:
         logger.error(f"Failed to count games in {file_path}: {e}")
         return 0
@@ -0,0 +1,36 @@
+"""CTC targets for known narration never contain the blank token.
+
+torchaudio's wav2vec2 bundles have no "[pad]" entry, so the blank is id 0 —
+which is also "-". Hyphenated narration ("a-file", "O-O") used to put the
+blank into the targets and forced_align rejected the whole clip.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("whisperx")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "apps" / "voice"))
+
+from aligner import AudioAligner  # noqa: E402
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz'"
+TORCHAUDIO_DICT = {"-": 0, "|": 1, **{c: i + 2 for i, c in enumerate(LETTERS)}}
+
+
+def _aligner():
+    aligner = AudioAligner.__new__(AudioAligner)
+    aligner.align_metadata = {"dictionary": TORCHAUDIO_DICT, "type": "torchaudio"}
+    return aligner
+
+
+def test_hyphenated_words_leave_the_blank_out():
+    tokens, spans = _aligner()._tokenize("the a-file opens mid-sentence after O-O")
+    assert 0 not in tokens
+    assert [w for w, _, _ in spans] == ["the", "a-file", "opens", "mid-sentence", "after", "O-O"]
+    # Every span still covers its own letters only
+    first, last = spans[1][1], spans[1][2]
+    assert tokens[first:last + 1] == [TORCHAUDIO_DICT[c] for c in "afile"]
@@ -0,0 +1,36 @@
+import sqlite3
+
+from chessbot_analyzer.utils.cache import CacheManager
+
+
+def test_set_many_round_trips_on_disk(tmp_path):
+    cache = CacheManager(cache_dir=str(tmp_path))
+    cache.set_many({"a": [{"pv_uci": ["e2e4"], "cp": 30}], "b": {"x": None}})
+    cache.set("c", [1, 2, 3])
+    cache.close()
+
+    reopened = CacheManager(cache_dir=str(tmp_path))
+    assert reopened.get("a") == [{"pv_uci": ["e2e4"], "cp": 30}]
+    assert reopened.get("b") == {"x": None}
+    assert reopened.get("c") == [1, 2, 3]
+    assert reopened.get("missing") is None
+    reopened.close()
+
+
+def test_reads_and_updates_legacy_text_table(tmp_path):
+    db = tmp_path / "legacy.sqlite"
+    conn = sqlite3.connect(str(db))
+    conn.execute(
+        "CREATE TABLE cache (key TEXT PRIMARY KEY, value TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    )
+    conn.execute("INSERT INTO cache (key, value) VALUES ('old', '{\"cp\": 12}')")
+    conn.commit()
+    conn.close()
+
+    cache = CacheManager(cache_dir=str(tmp_path), db_path=str(db))
+    assert cache.get("old") == {"cp": 12}
+    cache.set("old", {"cp": 40})
+    cache.set_many({"old": {"cp": 41}, "new": [1]})
+    assert cache.get("old") == {"cp": 41}
+    assert cache.get("new") == [1]
+    cache.close()
@@ -0,0 +1,35 @@
+"""A garbled archive body is retried like a network error, not raised."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]
+                       / "services" / "orchestrator" / "ingest"))
+
+import chesscom_fetch  # noqa: E402
+
+
+class _Resp:
+    status_code = 200
+
+    def __init__(self, body):
+        self.content = body
+
+    def raise_for_status(self):
+        pass
+
+
+def test_truncated_body_is_retried(monkeypatch):
+    bodies = iter([b'{"games": [', b'{"games": []}'])
+    monkeypatch.setattr(chesscom_fetch._SESSION, "get", lambda *a, **k: _Resp(next(bodies)))
+    monkeypatch.setattr(chesscom_fetch.time, "sleep", lambda s: None)
+    assert chesscom_fetch._get_json("https://api.chess.com/x", ua=None) == {"games": []}
+
+
+def test_garbage_every_time_raises_the_decode_error(monkeypatch):
+    monkeypatch.setattr(chesscom_fetch._SESSION, "get", lambda *a, **k: _Resp(b"<html>"))
+    monkeypatch.setattr(chesscom_fetch.time, "sleep", lambda s: None)
+    with pytest.raises(ValueError):
+        chesscom_fetch._get_json("https://api.chess.com/x", ua=None)
@@ -10,3 +10,10 @@ def test_bishop_diag_pin():
     board = chess.Board("k7/8/8/8/8/4b3/5N2/6K1 w - - 0 1")
     pins = FeatureDetectors.compute_pins(board)
     assert any(p.get("sq") == "f2" and p.get("attacker") == "e3" and p.get("king") == "g1" for p in pins)
+
+def test_attack_masks_match_is_attacked_by():
+    board = chess.Board("r1bqkbnr/pppp1ppp/2n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3")
+    white, black = FeatureDetectors.attack_masks(board)
+    for sq in chess.SQUARES:
+        assert bool(white & chess.BB_SQUARES[sq]) == board.is_attacked_by(chess.WHITE, sq)
+        assert bool(black & chess.BB_SQUARES[sq]) == board.is_attacked_by(chess.BLACK, sq)
@@ -0,0 +1,18 @@
+import pytest
+
+from chessbot_analyzer.utils.evals import cp_array_to_bar, cp_to_bar_value, format_evaluation
+
+
+def test_cp_array_to_bar_matches_scalar():
+    cps = [-10000, -450, -30, 0, 25, 400, 10000]
+    assert cp_array_to_bar(cps) == pytest.approx([cp_to_bar_value(cp) for cp in cps])
+    assert cp_array_to_bar([]) == []
+
+
+def test_format_evaluation():
+    assert [format_evaluation(cp) for cp in (0, 9, -9, 10, -10, 125, -340)] == [
+        "0.0", "0.0", "0.0", "+0.1", "-0.1", "+1.2", "-3.4",
+    ]
+    assert format_evaluation(150, show_sign=False) == "1.5"
+    assert format_evaluation({"type": "cp", "cp": 50}) == "+0.5"
+    assert format_evaluation({"type": "mate", "value": -3}) == "#-3"
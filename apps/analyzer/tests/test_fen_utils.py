@@ -0,0 +1,68 @@
+import chess
+import pytest
+
+from chessbot_analyzer.utils import fen as fen_utils
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+MATE = "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"
+
+
+def test_helpers_share_one_parsed_board_without_mutating_it():
+    assert len(fen_utils.get_legal_moves_san(START)) == 20
+    assert fen_utils.get_turn_color(START) == "white"
+    assert fen_utils.get_piece_at_square(START, "e1") == "K"
+    assert fen_utils.get_piece_at_square(START, "e4") is None
+    assert fen_utils.get_piece_at_square(START, "z9") is None
+    assert fen_utils.get_last_move_arrow(None, chess.Move.from_uci("g1f3")) == ("g1", "f3")
+    assert fen_utils._fen_view(START).board.fen() == START
+    assert fen_utils._fen_view(START) is fen_utils._fen_view(START)
+
+
+def test_helpers_on_invalid_and_terminal_positions():
+    assert fen_utils.is_checkmate(MATE)
+    assert fen_utils.get_legal_moves(MATE) == []
+    assert fen_utils.get_turn_color("not a fen") is None
+    assert fen_utils.is_check("not a fen") is False
+
+
+def test_fen_view_validates_once():
+    with pytest.raises(ValueError):
+        fen_utils.FenView("not a fen")
+    view = fen_utils.FenView(MATE)
+    assert view.is_checkmate() and not view.is_stalemate()
+    assert view.legal_moves() == [] and view.turn_color() == "white"
+    assert fen_utils.is_stalemate("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP1B1PPP/R2QKB1R w KQ - 0 8",
+        "R6R/8/8/8/8/8/8/k1K4R w - - 0 1",  # rank/file/both disambiguation
+        "N1N5/8/N7/8/8/8/8/k1K5 w - - 0 1",
+        "7k/P7/8/8/8/8/8/K7 w - - 0 1",  # promotion, mate
+        "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2",  # en passant
+        "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1",  # castling
+    ],
+)
+def test_legal_moves_san_matches_board_san(fen):
+    view = fen_utils.FenView(fen)
+    assert view.legal_moves_san() == tuple(view.board.san(m) for m in view.legal)
+
+
+class _FrozenBoard(chess.Board):
+    def push(self, move):
+        raise AssertionError("the shared board was mutated")
+
+    def copy(self, *, stack=True):
+        return chess.Board(self.fen())
+
+
+def test_san_never_mutates_the_shared_board():
+    # Cached views are used from several threads at once: SAN generation
+    # (which needs a push/pop for "+" vs "#") must not touch view.board
+    fen = "7k/P7/8/8/8/8/8/K7 w - - 0 1"  # promotion checks and mates
+    view = fen_utils.FenView(fen)
+    view.board = _FrozenBoard(fen)
+    plain = chess.Board(fen)
+    assert view.legal_moves_san() == tuple(plain.san(m) for m in plain.legal_moves)
@@ -0,0 +1,79 @@
+"""Ingest dedupes on a hash of the PGN: storing a game twice is a no-op that
+hands back the id the game already has, one id per input game."""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]
+                       / "services" / "orchestrator" / "ingest"))
+
+import ingest_db  # noqa: E402
+
+PGN_A = '[White "A"]\n[Black "B"]\n\n1. e4 e5 1-0\n'
+PGN_B = '[White "C"]\n[Black "D"]\n\n1. d4 d5 0-1\n'
+PGN_C = '[White "E"]\n[Black "F"]\n\n1. c4 *\n'
+
+
+def _game(pgn):
+    return {"pgn": pgn, "meta": {"white": pgn.split('"')[1], "ply_count": 2}}
+
+
+def _engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'games.db'}")
+
+
+def _count(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM games")).scalar()
+
+
+def test_fresh_schema_has_unique_sha1(tmp_path):
+    engine = _engine(tmp_path)
+    ingest_db.ensure_schema(engine)
+    ingest_db.ensure_schema(engine)  # idempotent
+    with engine.connect() as conn:
+        insp = inspect(conn)
+        assert "pgn_sha1" in {c["name"] for c in insp.get_columns("games")}
+        index = {i["name"]: i for i in insp.get_indexes("games")}["ix_games_sha1"]
+    assert index["unique"] and index["column_names"] == ["pgn_sha1"]
+    assert ingest_db.insert_games([_game(PGN_A), _game(PGN_B)], engine) == [1, 2]
+
+
+def test_duplicates_within_one_batch_share_an_id(tmp_path):
+    engine = _engine(tmp_path)
+    ids = ingest_db.insert_games([_game(PGN_A), _game(PGN_B), _game(PGN_A)], engine)
+    assert ids == [1, 2, 1]
+    assert _count(engine) == 2
+
+
+def test_duplicates_across_batches_and_chunks(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    assert ingest_db.insert_games([_game(PGN_A), _game(PGN_B)], engine) == [1, 2]
+    # Second batch: one new game, the rest already stored, split over chunks
+    monkeypatch.setattr(ingest_db, "_INSERT_CHUNK", 2)
+    ids = ingest_db.insert_games([_game(PGN_B), _game(PGN_C), _game(PGN_A), _game(PGN_C)], engine)
+    assert ids == [2, 3, 1, 3]
+    assert _count(engine) == 3
+
+
+def test_legacy_table_with_duplicates_migrates(tmp_path):
+    engine = _engine(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE games (
+              id INTEGER PRIMARY KEY, white TEXT, black TEXT, date TEXT, event TEXT,
+              result TEXT, eco TEXT, site TEXT, ply_count INTEGER, pgn TEXT NOT NULL
+            )"""))
+        conn.execute(text("INSERT INTO games (pgn) VALUES (:pgn)"),
+                     [{"pgn": PGN_A}, {"pgn": PGN_B}, {"pgn": PGN_A}])
+
+    ids = ingest_db.insert_games([_game(PGN_A), _game(PGN_C), _game(PGN_B)], engine)
+    # The first stored copy of a duplicated PGN is the one that gets its hash
+    assert ids == [1, 4, 2]
+    with engine.connect() as conn:
+        hashes = dict(conn.execute(text("SELECT id, pgn_sha1 FROM games ORDER BY id")).all())
+    assert hashes[3] is None
+    assert hashes[1] == ingest_db._pgn_sha1(PGN_A)
+    assert _count(engine) == 4
@@ -0,0 +1,106 @@
+"""Fetcher metadata counts plies with a regex over the movetext instead of
+building a game tree; it has to agree with python-chess on what the mainline
+is — comments, NAGs, nested variations and result tokens included."""
+
+import io
+import random
+import sys
+from pathlib import Path
+
+import chess
+import chess.pgn
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]
+                       / "services" / "orchestrator" / "ingest"))
+
+from pgn_meta import count_plies, normalize_metadata  # noqa: E402
+
+CHESSCOM = """[Event "Live Chess"]
+[Site "Chess.com"]
+[Date "2024.11.03"]
+[Round "-"]
+[White "eric"]
+[Black "rival99"]
+[Result "1-0"]
+[ECO "C50"]
+[TimeControl "180"]
+[Termination "eric won by checkmate"]
+
+1. e4 {[%clk 0:02:59.9]} 1... e5 {[%clk 0:02:58.1]} 2. Bc4 {[%clk 0:02:57]} 2... Nc6 {[%clk 0:02:55.4]} 3. Qh5 {[%clk 0:02:55]} 3... Nf6 {[%clk 0:02:50.2]} 4. Qxf7# {[%clk 0:02:54.1]} 1-0
+"""
+
+LICHESS = """[Event "Rated Blitz game"]
+[Site "https://lichess.org/abcdEFGH"]
+[Date "2024.05.01"]
+[White "notsmartmillion"]
+[Black "someone"]
+[Result "*"]
+[ECO "C42"]
+
+1. e4 { [%eval 0.3] } 1... e5 2. Nf3 Nf6 $6 ( 2... Nc6 3. Bb5 ( 3. Bc4 Bc5 { Italian } ) 3... a6 ) 3. Nxe5 d6 4. Nf3 Nxe4 5. d4?! $2 { a comment with 6. Qxe4 inside } 5... d5 6. Bd3 Be7 7. O-O O-O 8. c4 c6 9. Nc3 Nxc3 10. bxc3 dxc4 11. Bxc4 Nd7 *
+"""
+
+PROMOTION = """[Event "?"]
+[Result "1-0"]
+
+1. h4 g5 2. hxg5 h6 3. gxh6 Bg7 4. hxg7 Nf6 5. gxh8=Q+ Ng8 6. Qxg8# $1 { mate } 1-0
+"""
+
+
+def _mainline_plies(pgn: str) -> int:
+    return len(list(chess.pgn.read_game(io.StringIO(pgn)).mainline_moves()))
+
+
+def test_counts_match_python_chess_on_real_exports():
+    for pgn in (CHESSCOM, LICHESS, PROMOTION):
+        assert normalize_metadata(pgn)["ply_count"] == _mainline_plies(pgn)
+
+
+def test_metadata_matches_read_game_headers():
+    meta = normalize_metadata(CHESSCOM)
+    assert (meta["white"], meta["black"], meta["result"], meta["eco"]) == ("eric", "rival99", "1-0", "C50")
+    # Missing Seven Tag Roster tags read as "?", as read_game fills them
+    assert normalize_metadata(PROMOTION)["white"] == "?"
+    assert normalize_metadata("")["ply_count"] is None
+
+
+def _random_game(rng: random.Random) -> chess.pgn.Game:
+    game = chess.pgn.Game()
+    node, board = game, chess.Board()
+    for _ in range(rng.randrange(0, 80)):
+        moves = list(board.legal_moves)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        if len(moves) > 1 and rng.random() < 0.15:
+            # A side line, sometimes with a nested one of its own
+            alt = rng.choice([m for m in moves if m != move])
+            side = node.add_variation(alt, comment="alt 1. e4")
+            after = side.board()
+            replies = list(after.legal_moves)
+            if replies:
+                side.add_variation(replies[0])
+                if len(replies) > 1 and rng.random() < 0.5:
+                    # Second reply in the side line: printed nested inside it
+                    side.add_variation(replies[-1], nags={chess.pgn.NAG_DUBIOUS_MOVE})
+        node = node.add_main_variation(move)
+        if rng.random() < 0.2:
+            node.comment = "[%clk 0:01:00] 12. Nf3 mentioned"
+        if rng.random() < 0.2:
+            node.nags.add(rng.choice([chess.pgn.NAG_GOOD_MOVE, chess.pgn.NAG_BLUNDER, 14]))
+        board.push(move)
+    game.headers["Result"] = board.result() if board.is_game_over() else rng.choice(["*", "1-0", "0-1", "1/2-1/2"])
+    return game
+
+
+def test_counts_match_python_chess_on_generated_games():
+    rng = random.Random(1234)
+    for _ in range(200):
+        pgn = str(_random_game(rng))
+        assert normalize_metadata(pgn)["ply_count"] == _mainline_plies(pgn), pgn
+
+
+def test_count_plies_ignores_result_and_move_numbers():
+    assert count_plies("1. e4 e5 2. Nf3 1-0") == 3
+    assert count_plies("1. d4 1... d5 *") == 2
+    assert count_plies("*") == 0
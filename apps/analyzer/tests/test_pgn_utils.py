@@ -0,0 +1,67 @@
+import io
+
+import chess
+import chess.pgn
+
+from chessbot_analyzer.utils import pgn as pgn_utils
+
+PGN = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 *"
+
+
+def _game() -> chess.pgn.Game:
+    return chess.pgn.read_game(io.StringIO(PGN))
+
+
+def test_positions_after_move_match_replay():
+    game = _game()
+    board = game.board()
+    for ply, move in enumerate(game.mainline_moves(), start=1):
+        board.push(move)
+        assert pgn_utils.get_fen_after_move(game, ply) == board.fen()
+        assert pgn_utils.get_position_after_move(game, ply).fen() == board.fen()
+    assert list(pgn_utils.iter_fens(game))[-1] == board.fen()
+
+
+def test_position_after_move_out_of_range():
+    game = _game()
+    assert pgn_utils.get_position_after_move(game, 0) is None
+    assert pgn_utils.get_fen_after_move(game, 7) is None
+
+
+def test_header_scan_counts_and_reads_metadata(tmp_path):
+    path = tmp_path / "games.pgn"
+    path.write_text(
+        '[White "A"]\n[Black "B"]\n\n1. e4 e5 1-0\n\n[White "C"]\n[Black "D"]\n\n1. d4 {x} d5 (1... Nf6) 0-1\n',
+        encoding="utf-8",
+    )
+    assert pgn_utils.count_games_in_pgn(str(path)) == 2
+    assert pgn_utils.validate_pgn_file(str(path))
+    assert not pgn_utils.validate_pgn_file(str(tmp_path / "missing.pgn"))
+    metas = [pgn_utils.metadata_from_headers(h) for h in pgn_utils.iter_pgn_headers(str(path))]
+    assert [(m["white"], m["black"]) for m in metas] == [("A", "B"), ("C", "D")]
+
+
+def test_game_view_matches_direct_helpers():
+    game = _game()
+    view = pgn_utils.GameView(game)
+    assert pgn_utils.get_game_moves_uci(game, view) == pgn_utils.get_game_moves_uci(game)
+    assert pgn_utils.get_game_moves_san(game, view) == ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6"]
+    assert pgn_utils.compute_moves_hash(game, view) == pgn_utils.compute_moves_hash(game)
+    assert pgn_utils.get_fen_after_move(game, 6, view) == pgn_utils.get_fen_after_move(game, 6)
+    assert view.fens is not None and len(view.fens) == 7
+
+
+def test_metadata_ply_count_counts_mainline_moves():
+    game = _game()
+    assert pgn_utils.extract_game_metadata(game)["ply_count"] == 6
+    assert pgn_utils.extract_game_metadata(game, pgn_utils.GameView(game))["ply_count"] == 6
+    empty = chess.pgn.read_game(io.StringIO('[White "A"]\n\n*'))
+    assert pgn_utils.extract_game_metadata(empty)["ply_count"] == 0
+
+
+def test_helpers_respect_custom_start_position():
+    game = chess.pgn.read_game(io.StringIO(
+        '[FEN "4k3/8/8/8/8/8/8/R3K3 w Q - 0 1"]\n[SetUp "1"]\n\n1. O-O-O Kf7 *'
+    ))
+    assert pgn_utils.get_game_moves_san(game) == ["O-O-O", "Kf7"]
+    assert pgn_utils.get_fen_after_move(game, 2) == "8/5k2/8/8/8/8/8/2KR4 w - - 2 2"
@@ -1,8 +1,10 @@
 # apps/analyzer/tests/test_timeline_builder.py
 
+import json
+
 import chess
 
-from chessbot_analyzer.timeline import TimelineBuilder
+from chessbot_analyzer.timeline import SceneAlt, SceneMain, SceneReset, TimelineBuilder
 
 
 class FakeEngine:
@@ -49,6 +51,9 @@ def test_timeline_from_pgn_with_alts_and_pins():
     # Pin entries include 'color'
     for p in main["pins"]:
         assert "color" in p
+    # Attacked squares travel as 16-hex-digit bitmasks
+    assert len(main["attacked"]["whiteMask"]) == 16
+    assert int(main["attacked"]["blackMask"], 16) > 0
 
     # Alt scene should have pv + arrows and attacked after final step
     alt = [s for s in tl.scenes if s["type"] == "alt"][0]
@@ -61,3 +66,138 @@ def test_timeline_from_pgn_with_alts_and_pins():
 
     # Total duration accumulates
     assert tl.totalDurationMs > 0
+
+
+class CountingEngine(FakeEngine):
+    def __init__(self):
+        self.fens = []
+
+    def analyse(self, board: chess.Board, multipv: int, depth: int):
+        self.fens.append(board.fen())
+        return super().analyse(board, multipv, depth)
+
+
+def test_timeline_analyses_each_position_once():
+    pgn = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 *"
+    engine = CountingEngine()
+    tl = TimelineBuilder(engine=engine).from_pgn(pgn)
+
+    # 6 plies -> start position + 6 post-move positions
+    assert len(engine.fens) == 7
+    assert len(set(engine.fens)) == 7
+    mains = [s for s in tl.scenes if s["type"] == "main"]
+    assert [s["fen"] for s in mains] == engine.fens[1:]
+
+
+class DominantEngine(FakeEngine):
+    """PV1 is far ahead of every alternative."""
+
+    def analyse(self, board: chess.Board, multipv: int, depth: int):
+        infos = super().analyse(board, multipv, depth)
+        infos[0]["cp"] = 500
+        return infos
+
+
+def test_timeline_skips_alts_when_best_move_dominates():
+    pgn = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 *"
+    kwargs = dict(alt_preview_plies=2, alt_max=2, min_ply_for_alt=1, alt_drop_cp=0)
+
+    tl = TimelineBuilder(engine=DominantEngine()).from_pgn(pgn, **kwargs)
+    assert all(s["type"] == "main" for s in tl.scenes)
+
+    tl = TimelineBuilder(engine=DominantEngine()).from_pgn(pgn, alt_skip_cp_gap=10000, **kwargs)
+    assert any(s["type"] == "alt" for s in tl.scenes)
+
+
+def test_timeline_reuses_cached_analysis(tmp_path):
+    from chessbot_analyzer.utils.cache import CacheManager
+
+    pgn = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 *"
+    cache = CacheManager(cache_dir=str(tmp_path), db_path=":memory:")
+
+    first = CountingEngine()
+    tl1 = TimelineBuilder(engine=first, cache_manager=cache).from_pgn(pgn, min_ply_for_alt=1, alt_drop_cp=0)
+    second = CountingEngine()
+    tl2 = TimelineBuilder(engine=second, cache_manager=cache).from_pgn(pgn, min_ply_for_alt=1, alt_drop_cp=0)
+
+    assert len(first.fens) == 7
+    assert second.fens == []
+    assert tl2.scenes == tl1.scenes
+
+
+def test_timeline_scenes_match_models_and_save(tmp_path):
+    pgn = "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 *"
+    builder = TimelineBuilder(engine=FakeEngine())
+    tl = builder.from_pgn(pgn, min_ply_for_alt=1, alt_drop_cp=0)
+
+    models = {"main": SceneMain, "alt": SceneAlt, "reset": SceneReset}
+    for scene in tl.scenes:
+        assert models[scene["type"]](**scene).dict() == scene
+
+    out = tmp_path / "timeline.json"
+    builder.save(tl, str(out))
+    assert json.loads(out.read_text(encoding="utf-8")) == tl.dict()
+
+    alignment = tmp_path / "alignment.json"
+    alignment.write_text(json.dumps({"m1": {"keywords": {"fork": 0.4}}}), encoding="utf-8")
+    builder.apply_alignment_data(tl, str(alignment))
+    assert tl.scenes[0]["cueTimes"] == {"fork": 0.4}
+
+
+def test_load_audio_durations_reads_wav_headers(tmp_path):
+    import wave
+
+    with wave.open(str(tmp_path / "m1.wav"), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes(b"\x00\x00" * 24000)  # 1.5 s
+    (tmp_path / "m2.wav").write_bytes(b"not a wav")
+
+    durations = TimelineBuilder(engine=FakeEngine()).load_audio_durations(str(tmp_path))
+    assert durations == {"m1": 1500, "m2": 2000}
+
+
+class _RecordingPool(FakeEngine):
+    """Stands in for the EnginePool an engine-less builder owns; logs lifecycle calls."""
+
+    calls: list = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.calls.append("close")
+
+    def warm_up(self):
+        self.calls.append("warm_up")
+
+
+def _owned_builder(monkeypatch):
+    import chess.pgn
+
+    import chessbot_analyzer.engine as engine_mod
+
+    _RecordingPool.calls = []
+    monkeypatch.setattr(engine_mod, "EnginePool", _RecordingPool)
+    read_game = chess.pgn.read_game
+
+    def recording_read_game(handle):
+        _RecordingPool.calls.append("parse")
+        return read_game(handle)
+
+    monkeypatch.setattr(chess.pgn, "read_game", recording_read_game)
+    return TimelineBuilder()
+
+
+def test_owned_engines_warm_up_before_parse_and_close(monkeypatch):
+    _owned_builder(monkeypatch).from_pgn("1. e4 e5 *", min_ply_for_alt=99)
+    assert _RecordingPool.calls == ["warm_up", "parse", "close"]
+
+
+def test_invalid_pgn_still_closes_owned_engines(monkeypatch):
+    import pytest
+
+    with pytest.raises(ValueError):
+        _owned_builder(monkeypatch).from_pgn("")
+    assert _RecordingPool.calls == ["warm_up", "parse", "close"]
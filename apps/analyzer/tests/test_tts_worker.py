@@ -0,0 +1,77 @@
+"""The local pyttsx3 fallback: parallel across processes, one engine per clip.
+
+Reusing one engine for a whole batch is what wedges SAPI5 partway through,
+so the worker builds, uses and stops an engine for every clip even though it
+runs several clips at once.
+"""
+
+import multiprocessing as mp
+import sys
+import types
+import wave
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]
+                       / "services" / "orchestrator"))
+
+import tts  # noqa: E402
+import tts_worker  # noqa: E402
+
+
+class _FakeEngine:
+    instances = []
+
+    def __init__(self):
+        self.jobs = []
+        self.stopped = False
+        _FakeEngine.instances.append(self)
+
+    def setProperty(self, name, value):
+        pass
+
+    def getProperty(self, name):
+        return []
+
+    def save_to_file(self, text, path):
+        self.jobs.append((text, path))
+
+    def runAndWait(self):
+        # Half a second of 16 kHz silence per queued clip
+        for _text, path in self.jobs:
+            with wave.open(path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(16000)
+                wav.writeframes(bytes(16000))
+
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def fake_pyttsx3(monkeypatch):
+    _FakeEngine.instances = []
+    monkeypatch.setitem(sys.modules, "pyttsx3",
+                        types.SimpleNamespace(init=_FakeEngine))
+    return _FakeEngine
+
+
+def test_every_clip_gets_a_fresh_engine(fake_pyttsx3, tmp_path):
+    jobs = [(f"b{i}", f"line {i}", str(tmp_path / f"b{i}.wav")) for i in range(3)]
+    assert [tts_worker.synth_one(job) for job in jobs] == ["b0", "b1", "b2"]
+    engines = fake_pyttsx3.instances
+    assert len(engines) == 3
+    assert all(len(e.jobs) == 1 and e.stopped for e in engines)
+
+
+@pytest.mark.skipif(mp.get_start_method() != "fork",
+                    reason="the fake engine only reaches forked workers")
+def test_pool_round_trip_measures_every_clip(fake_pyttsx3, tmp_path, monkeypatch):
+    monkeypatch.setenv("TTS_LOCAL_WORKERS", "2")
+    lines = [{"id": f"b{i:04d}", "text": f"line number {i}"} for i in range(5)]
+    clips = tts._pyttsx3_synthesize(lines, tmp_path)
+    assert sorted(clips) == [line["id"] for line in lines]
+    assert all(c["durationMs"] == 500 for c in clips.values())
+    assert all(c["file"] == f"{sid}.wav" for sid, c in clips.items())
@@ -1,6 +1,7 @@
 import React, {useMemo} from 'react';
 import { useCurrentFrame } from 'remotion';
 import { Attacked } from '../types/timeline';
+import { maskToSquares } from '../lib/sq';
 
 interface HeatmapProps {
   attacked: Attacked;
@@ -53,11 +54,11 @@ export const Heatmap: React.FC<HeatmapProps> = ({
   const globalOpacity = 1;
   
   // Build sets
-  const whiteAttacks = new Set((attacked.white || []).filter((sq) => /^[a-h][1-8]$/.test(sq)));
-  const blackAttacks = new Set((attacked.black || []).filter((sq) => /^[a-h][1-8]$/.test(sq)));
+  const whiteAttacks = new Set(maskToSquares(attacked.whiteMask));
+  const blackAttacks = new Set(maskToSquares(attacked.blackMask));
 
-  const prevWhite = new Set((prevAttacked?.white || []).filter((sq) => /^[a-h][1-8]$/.test(sq)));
-  const prevBlack = new Set((prevAttacked?.black || []).filter((sq) => /^[a-h][1-8]$/.test(sq)));
+  const prevWhite = new Set(maskToSquares(prevAttacked?.whiteMask));
+  const prevBlack = new Set(maskToSquares(prevAttacked?.blackMask));
 
   // Newly attacked squares compared to previous frame
   const newly = new Set<string>();
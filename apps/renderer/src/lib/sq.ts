@@ -8,3 +8,20 @@ export const arrowPath = (from: string, to: string, size=512) => {
   const x2 = tx*cell + cell/2, y2 = ty*cell + cell/2;
   return {x1, y1, x2, y2};
 };
+// Decode a 16-hex-digit square mask (bit i = square i, a1 = bit 0) into names.
+// Walks nibbles so the 64-bit value never passes through a lossy JS number.
+export const maskToSquares = (hex: string | undefined): string[] => {
+  const out: string[] = [];
+  if (!hex) return out;
+  const digits = hex.padStart(16, '0');
+  for (let n = 0; n < 16; n++) {
+    const nibble = parseInt(digits[15 - n]!, 16);
+    for (let b = 0; b < 4; b++) {
+      if (nibble & (1 << b)) {
+        const sq = n * 4 + b;
+        out.push(String.fromCharCode(97 + (sq % 8)) + (Math.floor(sq / 8) + 1));
+      }
+    }
+  }
+  return out;
+};
@@ -9,8 +9,10 @@ export interface Pin {
 }
 
 export interface Attacked {
-  white: Sq[];
-  black: Sq[];
+  // 64-bit square masks as 16 hex digits (bit i = square i, a1 = bit 0).
+  // Decode with maskToSquares() from lib/sq.
+  whiteMask: string;
+  blackMask: string;
 }
 
 export interface SceneMain {
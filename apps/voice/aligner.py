@@ -4,10 +4,21 @@ Uses whisperX for forced alignment to get precise word timestamps.
 """
 
 import json
+import os
+import re
 import subprocess
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+
+# Persistent model caches under the repo, so warm starts skip the download
+# and weight conversion. Must be set before huggingface_hub/torch read them.
+_ROOT = Path(__file__).resolve().parents[2]
+os.environ.setdefault("HF_HOME", str(_ROOT / ".cache" / "hf"))
+os.environ.setdefault("TORCH_HOME", str(_ROOT / ".cache" / "torch"))
+
 import whisperx
 import torch
 import logging
@@ -15,34 +26,99 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4)
+def _load_align_model(language_code: str, device: str):
+    """whisperx.load_align_model, once per (language, device) per process."""
+    return whisperx.load_align_model(language_code=language_code, device=device)
+
+
+def clear_align_models():
+    """Forget the process-wide align models (aligners holding one keep it)."""
+    _load_align_model.cache_clear()
+
+# Loaded aligners keyed by (model_name, device), reused across calls
+_ALIGNER_CACHE: Dict[Tuple[str, str], "AudioAligner"] = {}
+
+
 class AudioAligner:
     """Forced alignment system for precise word-level timing."""
     
-    def __init__(self, model_name: str = "base", device: str = "auto"):
+    def __init__(self, model_name: str = "base", device: str = "auto", low_vram: bool = False):
         """
         Initialize the aligner with a Whisper model.
         
         Args:
             model_name: Whisper model size (tiny, base, small, medium, large)
             device: Device to use (auto, cpu, cuda)
+            low_vram: Free the Whisper model after transcribing, before alignment
         """
         self.model_name = model_name
         self.device = device if device != "auto" else ("cuda" if torch.cuda.is_available() else "cpu")
+        self.low_vram = low_vram
         self.model = None
+        self.faster_whisper = False
         self.align_model = None
         self.align_metadata = None
+        self.align_language = None
+        self._kw_cache: Dict[Tuple[str, ...], Tuple[frozenset, List[str], Optional[object]]] = {}
         
-    def load_models(self):
+    def load_models(self, language_code: str = "en"):
         """Load Whisper and alignment models."""
+        self.load_whisper_model()
+        self.load_align_model(language_code)
+
+    def load_whisper_model(self):
+        """Load the Whisper (transcription) model."""
         if self.model is None:
             logger.info(f"Loading Whisper model: {self.model_name}")
-            self.model = whisperx.load_model(self.model_name, device=self.device)
-            
-        if self.align_model is None:
-            logger.info("Loading alignment model")
-            self.align_model, self.align_metadata = whisperx.load_align_model(
-                language_code="en", device=self.device
+            try:
+                # CTranslate2 build of Whisper with quantized weights: INT8 on
+                # CPU, FP16 on GPU. Much faster than whisperx's FP32 CPU path.
+                from faster_whisper import WhisperModel  # type: ignore
+
+                self.model = WhisperModel(
+                    self.model_name,
+                    device=self.device,
+                    compute_type="int8" if self.device == "cpu" else "float16",
+                    cpu_threads=os.cpu_count() or 4,
+                    num_workers=2,
+                )
+                self.faster_whisper = True
+            except ImportError:
+                self.model = whisperx.load_model(self.model_name, device=self.device)
+                self.faster_whisper = False
+
+    def load_align_model(self, language_code: str = "en"):
+        """Load the CTC alignment model, pinned to this aligner's device."""
+        if self.align_model is None or self.align_language != language_code:
+            logger.info(f"Loading alignment model ({language_code})")
+            self.align_model, self.align_metadata = _load_align_model(language_code, self.device)
+            # Don't trust load_align_model to honor `device`: a CPU-resident
+            # align model runs fine, just several times slower, and silently.
+            self.align_model.to(self.device)
+            # Compare device types: "cuda:1" places parameters on type "cuda"
+            placed = next(self.align_model.parameters()).device.type
+            expected = torch.device(self.device).type
+            if placed != expected:
+                raise RuntimeError(f"align model on {placed}, expected {self.device}")
+            self.align_language = language_code
+
+    def _free_whisper_model(self):
+        """Drop the Whisper model so alignment gets the VRAM; reloaded lazily."""
+        self.model = None
+        if self.device == "cuda":
+            torch.cuda.empty_cache()
+    
+    def _transcribe(self, audio_path: str) -> Tuple[List[Dict], str]:
+        """Transcribe audio into whisperx-style segments plus detected language."""
+        if self.faster_whisper:
+            segments, info = self.model.transcribe(
+                audio_path, beam_size=1, word_timestamps=False, vad_filter=True
             )
+            # The generator runs the decode; drain it into plain dicts
+            return [{"start": s.start, "end": s.end, "text": s.text} for s in segments], info.language
+        result = self.model.transcribe(audio_path)
+        return result["segments"], result.get("language") or "en"
     
     def align_audio(self, audio_path: str, text: str) -> List[Dict]:
         """
@@ -55,17 +131,20 @@ class AudioAligner:
         Returns:
             List of word dictionaries with start, end, word, confidence
         """
-        self.load_models()
+        self.load_whisper_model()
         
         try:
             # Transcribe audio
             logger.info(f"Transcribing audio: {audio_path}")
-            result = self.model.transcribe(audio_path)
+            segments, language = self._transcribe(audio_path)
+            if self.low_vram:
+                self._free_whisper_model()
+            self.load_align_model(language)
             
             # Align with text
             logger.info("Aligning transcription with text")
             aligned_result = whisperx.align(
-                result["segments"], 
+                segments, 
                 self.align_model, 
                 self.align_metadata, 
                 audio_path, 
@@ -90,6 +169,66 @@ class AudioAligner:
             logger.error(f"Alignment failed for {audio_path}: {e}")
             return []
     
+    def align_known_text(self, audio_path: str, text: str) -> List[Dict]:
+        """
+        Word timestamps for audio whose transcript is already known.
+        
+        The clips come from our own TTS, so Whisper's transcription would only
+        be thrown away: this skips it and force-aligns the CTC emissions
+        against ``text`` directly. Only the align model is loaded.
+        
+        Args:
+            audio_path: Path to audio file
+            text: Exact text spoken in the clip
+            
+        Returns:
+            List of word dictionaries (same shape as align_audio)
+        """
+        try:
+            waveform = self._load_waveform(audio_path)
+            words = self.align_waveform(waveform, text)
+            logger.info(f"Aligned {len(words)} words")
+            return words
+        except Exception as e:
+            logger.error(f"Alignment failed for {audio_path}: {e}")
+            return []
+    
+    def align_waveform(self, waveform: "torch.Tensor", text: str) -> List[Dict]:
+        """
+        align_known_text for a waveform that is already in memory.
+        
+        Args:
+            waveform: Mono 16 kHz samples (as from _load_waveform)
+            text: Exact text spoken in the clip
+            
+        Returns:
+            List of word dictionaries (same shape as align_audio)
+        """
+        self.load_align_model()
+        emissions, frame_counts = self._emissions([waveform])
+        n_frames = frame_counts[0]
+        seconds_per_frame = waveform.shape[0] / 16000 / max(1, n_frames)
+        return self._align_emission(emissions[0, :n_frames], text, seconds_per_frame)
+    
+    def _compile_keywords(self, keywords: List[str]) -> Tuple[frozenset, List[str], Optional[object]]:
+        """
+        Lowercased keyword set, list, and one alternation regex over them
+        (RE2 when google-re2 is installed), built once per keyword list.
+        """
+        key = tuple(keywords)
+        compiled = self._kw_cache.get(key)
+        if compiled is None:
+            lowered = [kw.lower() for kw in keywords]
+            pattern = None
+            if lowered:
+                try:
+                    import re2 as regex  # type: ignore
+                except ImportError:
+                    import re as regex
+                pattern = regex.compile("|".join(re.escape(kw) for kw in lowered))
+            compiled = self._kw_cache[key] = (frozenset(lowered), lowered, pattern)
+        return compiled
+
     def extract_keywords(self, words: List[Dict], keywords: List[str]) -> Dict[str, float]:
         """
         Extract timestamps for specific keywords.
@@ -101,20 +240,25 @@ class AudioAligner:
         Returns:
             Dictionary mapping keywords to start times
         """
+        exact, lowered, pattern = self._compile_keywords(keywords)
         keyword_times = {}
         
         for word_info in words:
             word = word_info["word"].lower().strip(".,!?")
             
             # Check for exact matches
-            if word in [kw.lower() for kw in keywords]:
+            if word in exact:
                 keyword_times[word] = word_info["start"]
                 continue
             
-            # Check for partial matches (e.g., "pinned" in "unpinned")
-            for keyword in keywords:
-                if keyword.lower() in word:
-                    keyword_times[keyword.lower()] = word_info["start"]
+            # Check for partial matches (e.g., "pinned" in "unpinned"). One
+            # regex search rules out the usual non-keyword word; on a hit the
+            # earliest keyword in the list wins, as with a plain linear scan
+            if pattern is None or pattern.search(word) is None:
+                continue
+            for keyword in lowered:
+                if keyword in word:
+                    keyword_times[keyword] = word_info["start"]
                     break
         
         return keyword_times
@@ -137,7 +281,11 @@ class AudioAligner:
             logger.warning(f"Audio file not found: {audio_path}")
             return {"scene_id": scene_id, "words": [], "keywords": {}}
         
-        words = self.align_audio(audio_path, text)
+        # Known text goes straight to forced alignment; transcribe only without it
+        if text and text.strip():
+            words = self.align_known_text(audio_path, text)
+        else:
+            words = self.align_audio(audio_path, text)
         
         result = {
             "scene_id": scene_id,
@@ -150,9 +298,238 @@ class AudioAligner:
         
         return result
 
+    def _load_waveform(self, audio_path: str) -> "torch.Tensor":
+        """Mono 16 kHz waveform for the alignment model."""
+        import torchaudio
+
+        waveform, sr = torchaudio.load(audio_path)
+        waveform = waveform.mean(dim=0)
+        if sr != 16000:
+            waveform = torchaudio.functional.resample(waveform, sr, 16000)
+        return waveform
+
+    def _emissions(self, waveforms: List["torch.Tensor"]) -> Tuple["torch.Tensor", List[int]]:
+        """
+        Run the CTC model once over a padded batch of clips.
+        
+        Returns:
+            (log-probabilities [B, frames, vocab] on CPU, valid frame count per clip)
+        """
+        lengths = torch.tensor([w.shape[0] for w in waveforms])
+        batch = torch.nn.utils.rnn.pad_sequence(waveforms, batch_first=True).to(self.device)
+        with torch.inference_mode():
+            if self.align_metadata["type"] == "torchaudio":
+                # lengths masks the padding out of the transformer's attention
+                emissions, frame_lengths = self.align_model(batch, lengths.to(self.device))
+            else:
+                mask = (torch.arange(batch.shape[1])[None, :] < lengths[:, None]).long()
+                emissions = self.align_model(batch, attention_mask=mask.to(self.device)).logits
+                frame_lengths = self.align_model._get_feat_extract_output_lengths(lengths)
+            emissions = torch.log_softmax(emissions, dim=-1).cpu()
+        return emissions, [int(n) for n in frame_lengths]
+
+    def _blank_id(self) -> int:
+        dictionary = self.align_metadata["dictionary"]
+        return next((dictionary[k] for k in ("[pad]", "<pad>") if k in dictionary), 0)
+
+    def _tokenize(self, text: str) -> Tuple[List[int], List[Tuple[str, int, int]]]:
+        """
+        CTC targets for a known transcript.
+        
+        Returns:
+            (token ids, [(word, first token index, last token index)])
+        """
+        dictionary = self.align_metadata["dictionary"]
+        separator = dictionary.get("|")
+        # torchaudio bundles have no [pad]: the blank is id 0, which is "-".
+        # A blank among the targets makes forced_align refuse the whole clip.
+        blank = self._blank_id()
+        tokens: List[int] = []
+        spans: List[Tuple[str, int, int]] = []
+        for word in text.split():
+            ids = [dictionary[c] for c in word.lower() if dictionary.get(c, blank) != blank]
+            if not ids:
+                continue
+            if tokens and separator is not None:
+                tokens.append(separator)
+            spans.append((word, len(tokens), len(tokens) + len(ids) - 1))
+            tokens.extend(ids)
+        return tokens, spans
+
+    def _forced_align_ta(self, emission: "torch.Tensor", tokens: List[int]) -> List[Tuple[int, int, float]]:
+        """
+        CTC forced alignment with torchaudio's fused Viterbi kernel.
+        
+        Returns:
+            (token index, frame, probability) for every frame assigned to a token
+        """
+        import torchaudio.functional as F
+
+        targets = torch.tensor([tokens], dtype=torch.int32, device=emission.device)
+        labels, scores = F.forced_align(emission[None], targets, blank=self._blank_id())
+        points = []
+        # merge_tokens yields one span per target token, in transcript order
+        for token_index, span in enumerate(F.merge_tokens(labels[0], scores[0].exp())):
+            for frame in range(span.start, span.end):
+                points.append((token_index, frame, float(span.score)))
+        return points
+
+    def _backtrack_whisperx(self, emission: "torch.Tensor", tokens: List[int]) -> List[Tuple[int, int, float]]:
+        """Same result as _forced_align_ta via whisperx's Python trellis (older torchaudio)."""
+        from whisperx.alignment import backtrack, get_trellis
+
+        blank_id = self._blank_id()
+        trellis = get_trellis(emission, tokens, blank_id=blank_id)
+        path = backtrack(trellis, emission, tokens, blank_id=blank_id) or []
+        return [(p.token_index, p.time_index, p.score) for p in path]
+
+    def _align_emission(self, emission: "torch.Tensor", text: str, seconds_per_frame: float) -> List[Dict]:
+        """Align one clip's emissions to its text and turn the path into word timestamps."""
+        tokens, spans = self._tokenize(text)
+        if not tokens:
+            return []
+        try:
+            path = self._forced_align_ta(emission, tokens)
+        except (ImportError, AttributeError):
+            # torchaudio < 2.1 has no forced_align
+            path = self._backtrack_whisperx(emission, tokens)
+        except (ValueError, RuntimeError) as e:
+            # e.g. more targets than frames: the trellis still finds a path
+            logger.warning(f"forced_align failed ({e}); using the whisperx trellis")
+            path = self._backtrack_whisperx(emission, tokens)
+        if not path:
+            return []
+
+        frames: Dict[int, List[Tuple[int, float]]] = {}
+        for token_index, frame, score in path:
+            frames.setdefault(token_index, []).append((frame, score))
+
+        words = []
+        for word, first, last in spans:
+            hits = [hit for ti in range(first, last + 1) for hit in frames.get(ti, ())]
+            if not hits:
+                continue
+            words.append({
+                "word": word,
+                "start": round(min(t for t, _ in hits) * seconds_per_frame, 3),
+                "end": round((max(t for t, _ in hits) + 1) * seconds_per_frame, 3),
+                "confidence": round(sum(score for _, score in hits) / len(hits), 3)
+            })
+        return words
+
+    def align_batch(self, items: List[Tuple[str, str, str]], batch_size: int = 16) -> Dict[str, List[Dict]]:
+        """
+        Force-align many clips against their known text, batching the CTC model.
+        
+        Short clips one at a time leave the GPU mostly idle; here each batch of
+        clips is padded into one tensor and the alignment model runs once per
+        batch. Paths are then found per clip with torchaudio's forced_align on
+        CPU threads, overlapping with the next batch's forward pass, and the
+        next batch's audio is read and resampled while the current one runs.
+        Clips of a batch that fails to load or run are retried one at a time
+        through align_scene.
+        
+        Args:
+            items: (scene_id, audio_path, text) per clip
+            batch_size: Clips per forward pass
+            
+        Returns:
+            Dictionary mapping scene ids to word lists (same shape as align_audio)
+        """
+        # Known text: no transcription, so only the align model is needed
+        self.load_align_model()
+        pending: Dict[str, Future] = {}
+        failed: List[Tuple[str, str, str]] = []
+        chunks = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as pool, \
+                ThreadPoolExecutor(max_workers=4) as loader:
+            def prefetch(chunk):
+                return [loader.submit(self._load_waveform, path) for _, path, _ in chunk]
+            
+            # Double-buffered: decoding batch k+1 overlaps batch k's forward pass
+            loads = prefetch(chunks[0]) if chunks else []
+            for k, chunk in enumerate(chunks):
+                current, loads = loads, (prefetch(chunks[k + 1]) if k + 1 < len(chunks) else [])
+                try:
+                    waveforms = [f.result() for f in current]
+                    emissions, frame_counts = self._emissions(waveforms)
+                except Exception as e:
+                    # One bad clip must not cost the rest of the batch their timings
+                    logger.error(f"Batch alignment failed ({len(chunk)} clips): {e}; aligning one by one")
+                    failed.extend(chunk)
+                    continue
+                
+                # Hand the CPU-side path search to the pool right away and go
+                # on to the next forward pass (the alignment ops release the GIL)
+                for j, (scene_id, _, text) in enumerate(chunk):
+                    n_frames = frame_counts[j]
+                    seconds_per_frame = waveforms[j].shape[0] / 16000 / max(1, n_frames)
+                    pending[scene_id] = pool.submit(
+                        self._align_emission, emissions[j, :n_frames], text, seconds_per_frame
+                    )
+            
+            results: Dict[str, List[Dict]] = {}
+            for scene_id, _, _ in items:
+                future = pending.get(scene_id)
+                try:
+                    results[scene_id] = future.result() if future is not None else []
+                except Exception as e:
+                    logger.error(f"Alignment failed for {scene_id}: {e}")
+                    results[scene_id] = []
+        
+        for scene_id, path, text in failed:
+            results[scene_id] = self.align_scene(scene_id, path, text)["words"]
+        
+        logger.info(f"Batch-aligned {len(items)} clips")
+        return results
+
+    def close(self):
+        """
+        Release this aligner's model references (and cached GPU memory).
+        
+        Align models are shared through _load_align_model with other aligners,
+        so they stay cached; clear_align_models() drops them for the process.
+        """
+        self.model = None
+        self.align_model = None
+        self.align_metadata = None
+        self.align_language = None
+        if self.device == "cuda":
+            torch.cuda.empty_cache()
+
+
+def get_aligner(model_name: str = "base", device: str = "auto") -> AudioAligner:
+    """
+    Get an aligner, reusing one (and its loaded models) from an earlier call.
+    
+    Args:
+        model_name: Whisper model size
+        device: Device to use (auto, cpu, cuda)
+        
+    Returns:
+        Cached AudioAligner
+    """
+    key = (model_name, device)
+    aligner = _ALIGNER_CACHE.get(key)
+    if aligner is None:
+        # Models load on first use (only the ones a caller needs) and then
+        # stay loaded on the cached instance
+        aligner = _ALIGNER_CACHE[key] = AudioAligner(model_name, device)
+    return aligner
+
+
+def close_aligners():
+    """Release every cached aligner's models, and the shared align models."""
+    for aligner in _ALIGNER_CACHE.values():
+        aligner.close()
+    _ALIGNER_CACHE.clear()
+    clear_align_models()
+
 
 def align_voice_lines(lines_file: str, audio_dir: str, output_file: str, 
-                     keywords: Optional[List[str]] = None):
+                     keywords: Optional[List[str]] = None,
+                     model_name: str = "base", device: str = "auto"):
     """
     Align all voice lines and save results.
     
@@ -161,23 +538,49 @@ def align_voice_lines(lines_file: str, audio_dir: str, output_file: str,
         audio_dir: Directory containing audio files
         output_file: Output file for alignment data
         keywords: Keywords to extract timestamps for
+        model_name: Whisper model size
+        device: Device to use (auto, cpu, cuda)
     """
-    aligner = AudioAligner()
+    aligner = get_aligner(model_name, device)
     
     # Load voice lines
     with open(lines_file, 'r') as f:
         lines = json.load(f)
     
     alignments = {}
+    items = []
+    untexted = []
     
     for line in lines:
         scene_id = line["id"]
-        text = line["text"]
         audio_path = Path(audio_dir) / f"{scene_id}.wav"
-        
+        if not audio_path.exists():
+            logger.warning(f"Audio file not found: {audio_path}")
+            continue
+        text = line.get("text") or ""
+        if text.strip():
+            items.append((scene_id, str(audio_path), text))
+        else:
+            untexted.append((scene_id, str(audio_path)))
+    
+    # Lines with known text are aligned against it directly, many clips per
+    # model call; only lines without text need transcribing first
+    logger.info(f"Aligning {len(items)} scenes")
+    words_by_scene = aligner.align_batch(items)
+    for scene_id, audio_path in untexted:
         logger.info(f"Aligning scene: {scene_id}")
-        alignment = aligner.align_scene(scene_id, str(audio_path), text, keywords)
-        alignments[scene_id] = alignment
+        words_by_scene[scene_id] = aligner.align_scene(scene_id, audio_path, "")["words"]
+    
+    for line in lines:
+        scene_id = line["id"]
+        if scene_id not in words_by_scene:
+            continue
+        words = words_by_scene[scene_id]
+        alignments[scene_id] = {
+            "scene_id": scene_id,
+            "words": words,
+            "keywords": aligner.extract_keywords(words, keywords) if keywords else {}
+        }
     
     # Save alignment data
     with open(output_file, 'w') as f:
@@ -229,4 +632,7 @@ if __name__ == "__main__":
     
     keywords = args.keywords or get_chess_keywords()
     
-    align_voice_lines(args.lines, args.audio_dir, args.output, keywords)
+    try:
+        align_voice_lines(args.lines, args.audio_dir, args.output, keywords, model_name=args.model)
+    finally:
+        close_aligners()
@@ -26,9 +26,15 @@ import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with the analyzer deps
+    orjson = None
+
 ROOT = Path(__file__).resolve().parents[2]
 OUT = ROOT / "outputs"
 AUDIO_DIR = OUT / "audio"
@@ -59,6 +65,13 @@ MIN_ARROW_DWELL_MS = 1500
 VOICE_BACKENDS = {"ttsapi", "qwen", "elevenlabs"}
 
 
+def _dump_json(obj: Any) -> bytes:
+    """Indented UTF-8 JSON, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
 def _load_dotenv() -> None:
     env_path = ROOT / ".env"
     if not env_path.exists():
@@ -460,18 +473,30 @@ def resolve_timing(script: Dict[str, Any], manifest: Dict[str, Any]) -> None:
               f"{MIN_ARROW_DWELL_MS}ms on screen")
 
 
+def _fast_publish(src: Path, dst: Path) -> None:
+    """Put `src` at `dst` without copying bytes when possible.
+
+    A hardlink costs one inode entry. Safe here because the clips in
+    outputs/audio are only ever replaced (the folder is cleared before
+    synthesis), never rewritten in place. Across filesystems, fall back to
+    copyfile, which is a kernel-side sendfile on Linux.
+    """
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
 def sync_to_public(script: Dict[str, Any], manifest: Dict[str, Any]) -> None:
     _clear_dir(PUB_AUDIO)
     PUB_AUDIO.mkdir(parents=True, exist_ok=True)
 
-    for clip in (manifest.get("clips") or {}).values():
-        src = AUDIO_DIR / clip["file"]
-        if src.exists():
-            shutil.copy2(src, PUB_AUDIO / src.name)
+    srcs = [AUDIO_DIR / clip["file"] for clip in (manifest.get("clips") or {}).values()]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda src: _fast_publish(src, PUB_AUDIO / src.name), [p for p in srcs if p.exists()]))
 
-    (PUB / "script.json").write_text(
-        json.dumps(script, indent=2, ensure_ascii=False), encoding="utf-8"
-    )
+    (PUB / "script.json").write_bytes(_dump_json(script))
     # Remove artifacts from the previous (scene-based) pipeline so a stale file
     # can never be picked up by the renderer.
     for stale in ("timeline.json", "audio_durations.json"):
@@ -780,9 +805,7 @@ def main() -> int:
             return 4
 
     if apply_think_pauses(script, manifest):
-        (OUT / "audio_manifest.json").write_text(
-            json.dumps(manifest, indent=2), encoding="utf-8"
-        )
+        (OUT / "audio_manifest.json").write_bytes(_dump_json(manifest))
     resolve_timing(script, manifest)
     save_script(script, OUT / "script.json")
 
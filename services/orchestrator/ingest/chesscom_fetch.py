@@ -17,13 +17,27 @@ import os
 import sys
 import json
 import time
+import asyncio
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 import chess.pgn
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson ships with the analyzer deps
+    _json_loads = json.loads
+
+try:
+    from .pgn_meta import normalize_metadata as _normalize_metadata
+except ImportError:  # run as a script: this directory is on sys.path
+    from pgn_meta import normalize_metadata as _normalize_metadata
+
 # ----------------- Config / headers -----------------
 
 def _user_agent(override: Optional[str] = None) -> str:
@@ -37,11 +51,19 @@ def _user_agent(override: Optional[str] = None) -> str:
 def _headers(ua: Optional[str] = None) -> Dict[str, str]:
     return {"User-Agent": _user_agent(ua)}
 
+# One pooled keep-alive session: archive fetches reuse TCP/TLS connections
+# instead of handshaking per request. Retries stay in _get_json (429-aware).
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+# Chess.com answers parallel requests with 429s past a few at once
+_ARCHIVE_WORKERS = 4
+
 def _get_json(url: str, ua: Optional[str], timeout: int = 60, retries: int = 3, backoff: float = 1.5) -> Dict:
     last_err = None
     for attempt in range(1, retries + 1):
         try:
-            r = requests.get(url, headers=_headers(ua), timeout=timeout)
+            r = _SESSION.get(url, headers=_headers(ua), timeout=timeout)
             # Handle 429/5xx politely with backoff
             if r.status_code in (429, 500, 502, 503, 504):
                 wait = backoff ** (attempt - 1)
@@ -49,36 +71,59 @@ def _get_json(url: str, ua: Optional[str], timeout: int = 60, retries: int = 3,
                 last_err = requests.HTTPError(f"{r.status_code} for {url}")
                 continue
             r.raise_for_status()
-            return r.json()
-        except requests.RequestException as e:
+            # Monthly archives run to megabytes; parse the raw bytes with orjson
+            return _json_loads(r.content)
+        except (requests.RequestException, ValueError) as e:
+            # ValueError: a truncated or garbage body (orjson's and json's
+            # JSONDecodeError), retried as r.json()'s RequestException was
             last_err = e
             # small linear backoff for all other cases
             time.sleep(0.75 * attempt)
     raise last_err or RuntimeError(f"Failed to fetch {url}")
 
-# ----------------- PGN helpers -----------------
-
-def _normalize_metadata(pgn: str) -> Dict:
-    game = chess.pgn.read_game(io := __import__("io").StringIO(pgn))
-    headers = game.headers if game else {}
-    meta = {
-        "white": headers.get("White"),
-        "black": headers.get("Black"),
-        "date": headers.get("Date"),
-        "event": headers.get("Event"),
-        "result": headers.get("Result"),
-        "eco": headers.get("ECO"),
-        "site": headers.get("Site"),
-        "ply_count": None,
-    }
-    if game:
-        ply = 0
-        node = game
-        while node.variations:
-            node = node.variations[0]
-            ply += 1
-        meta["ply_count"] = ply
-    return meta
+async def _get_json_async(client, url: str, sem: asyncio.Semaphore, retries: int = 3, backoff: float = 1.5) -> Dict:
+    """_get_json on an httpx.AsyncClient: same retry policy, waits without a thread."""
+    import httpx  # type: ignore
+
+    last_err: Optional[Exception] = None
+    for attempt in range(1, retries + 1):
+        try:
+            async with sem:
+                r = await client.get(url)
+            if r.status_code in (429, 500, 502, 503, 504):
+                await asyncio.sleep(backoff ** (attempt - 1))
+                last_err = httpx.HTTPStatusError(f"{r.status_code} for {url}", request=r.request, response=r)
+                continue
+            r.raise_for_status()
+            return _json_loads(r.content)
+        except (httpx.HTTPError, ValueError) as e:
+            last_err = e
+            await asyncio.sleep(0.75 * attempt)
+    raise last_err or RuntimeError(f"Failed to fetch {url}")
+
+async def _fetch_archives_async(archives: List[str], ua: Optional[str]) -> List[Dict]:
+    """Download all archives on one event loop, at most _ARCHIVE_WORKERS in flight."""
+    import httpx  # type: ignore
+
+    sem = asyncio.Semaphore(_ARCHIVE_WORKERS)
+    async with httpx.AsyncClient(headers=_headers(ua), timeout=60) as client:
+        # gather keeps them in month order
+        return await asyncio.gather(*(_get_json_async(client, a, sem) for a in archives))
+
+def _fetch_archives(archives: List[str], ua: Optional[str]) -> List[Dict]:
+    """Archive JSON in month order: httpx async when installed, else the thread pool."""
+    try:
+        import httpx  # type: ignore  # noqa: F401
+    except ImportError:
+        httpx = None
+    if httpx is not None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(_fetch_archives_async(archives, ua))
+        # Called from inside an event loop: asyncio.run is not allowed there
+    with ThreadPoolExecutor(max_workers=min(_ARCHIVE_WORKERS, len(archives))) as pool:
+        return list(pool.map(lambda a: _get_json(a, ua=ua), archives))
 
 # ----------------- Fetchers -----------------
 
@@ -103,15 +148,15 @@ def fetch_latest(username: str, months_back: int = 1, ua: Optional[str] = None)
     archives = data.get("archives", [])
     archives = sorted(archives)[-months_back:] if months_back > 0 else archives[-1:]
     out: List[Dict] = []
-    for a in archives:
-        month_data = _get_json(a, ua=ua)
+    if not archives:
+        return out
+    # Archives download concurrently, returned in month order
+    for month_data in _fetch_archives(archives, ua):
         for g in month_data.get("games", []):
             pgn = g.get("pgn")
             if not pgn:
                 continue
             out.append({"pgn": pgn, "meta": _normalize_metadata(pgn)})
-        # small courtesy delay
-        time.sleep(0.25)
     return out
 
 # ----------------- IO -----------------
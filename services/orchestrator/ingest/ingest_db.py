@@ -13,7 +13,8 @@ CREATE TABLE games (
   eco TEXT,
   site TEXT,
   ply_count INTEGER,
-  pgn TEXT NOT NULL
+  pgn TEXT NOT NULL,
+  pgn_sha1 TEXT          -- unique; re-ingesting the same PGN is a no-op
 );
 
 Swap AUTOINCREMENT to SERIAL if you use Postgres. With SQLAlchemy it works cross-DB.
@@ -21,12 +22,29 @@ Swap AUTOINCREMENT to SERIAL if you use Postgres. With SQLAlchemy it works cross
 
 from __future__ import annotations
 
+import hashlib
 from typing import Dict, List, Optional
-from sqlalchemy import text, create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import bindparam, create_engine, inspect, text
+from sqlalchemy.engine import Connection, Engine
 
 from chessbot_analyzer.config import settings
 
+# Duplicates (same pgn_sha1) are skipped by the unique index, not re-inserted.
+# ON CONFLICT ... DO NOTHING works on Postgres and SQLite >= 3.24.
+_INSERT_SQL = text("""
+  INSERT INTO games (white, black, date, event, result, eco, site, ply_count, pgn, pgn_sha1)
+  VALUES (:white, :black, :date, :event, :result, :eco, :site, :ply_count, :pgn, :pgn_sha1)
+  ON CONFLICT (pgn_sha1) DO NOTHING
+""")
+_IDS_SQL = text("SELECT id, pgn_sha1 FROM games WHERE pgn_sha1 IN :hashes").bindparams(
+    bindparam("hashes", expanding=True)
+)
+# Hashes per id lookup; SQLite allowed only 999 bound parameters before 3.32
+_INSERT_CHUNK = 500
+
+def _pgn_sha1(pgn: Optional[str]) -> str:
+    return hashlib.sha1((pgn or "").encode("utf-8")).hexdigest()
+
 def _engine() -> Engine:
     return create_engine(settings.DB_URL)
 
@@ -50,40 +68,59 @@ def ensure_schema(engine: Optional[Engine] = None) -> None:
     # If using SQLite, INTEGER PRIMARY KEY auto-increments.
     with eng.begin() as conn:
         conn.execute(text(ddl))
+        if "pgn_sha1" not in {c["name"] for c in inspect(conn).get_columns("games")}:
+            conn.execute(text("ALTER TABLE games ADD COLUMN pgn_sha1 TEXT"))
+            _backfill_sha1(conn)
+        conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_games_sha1 ON games (pgn_sha1)"))
+
+def _backfill_sha1(conn: Connection) -> None:
+    """Hash games stored before pgn_sha1 existed. Only the first copy of an
+    already-duplicated PGN gets its hash (the rest stay NULL), so the unique
+    index can still be built."""
+    seen = set()
+    updates = []
+    for game_id, pgn in conn.execute(text("SELECT id, pgn FROM games ORDER BY id")):
+        sha1 = _pgn_sha1(pgn)
+        if sha1 not in seen:
+            seen.add(sha1)
+            updates.append({"id": game_id, "sha1": sha1})
+    if updates:
+        conn.execute(text("UPDATE games SET pgn_sha1 = :sha1 WHERE id = :id"), updates)
+
+def _row(g: Dict) -> Dict:
+    m = g.get("meta") or {}
+    return {
+        "white": m.get("white"),
+        "black": m.get("black"),
+        "date": m.get("date"),
+        "event": m.get("event"),
+        "result": m.get("result"),
+        "eco": m.get("eco"),
+        "site": m.get("site"),
+        "ply_count": m.get("ply_count"),
+        "pgn": g.get("pgn"),
+        "pgn_sha1": _pgn_sha1(g.get("pgn")),
+    }
 
 def insert_games(games: List[Dict], engine: Optional[Engine] = None) -> List[int]:
     """
     games: [{"pgn": "...", "meta": {...}}, ...]
-    returns inserted ids
+    returns one id per game, in input order — the existing row's id for a PGN
+    that was already stored (it is not inserted again)
     """
     eng = engine or _engine()
     ensure_schema(eng)
 
+    rows = [_row(g) for g in games]
     ids: List[int] = []
-    ins = text("""
-      INSERT INTO games (white, black, date, event, result, eco, site, ply_count, pgn)
-      VALUES (:white, :black, :date, :event, :result, :eco, :site, :ply_count, :pgn)
-      RETURNING id
-    """)
 
+    # One transaction; per chunk, one executemany for the rows and one query
+    # for their ids, instead of a round-trip per game
     with eng.begin() as conn:
-        for g in games:
-            m = g.get("meta") or {}
-            res = conn.execute(ins, {
-                "white": m.get("white"),
-                "black": m.get("black"),
-                "date": m.get("date"),
-                "event": m.get("event"),
-                "result": m.get("result"),
-                "eco": m.get("eco"),
-                "site": m.get("site"),
-                "ply_count": m.get("ply_count"),
-                "pgn": g.get("pgn"),
-            })
-            try:
-                new_id = res.scalar_one()
-            except Exception:
-                # SQLite without RETURNING in old versions; fallback:
-                new_id = conn.execute(text("SELECT last_insert_rowid()")).scalar()
-            ids.append(int(new_id))
+        for i in range(0, len(rows), _INSERT_CHUNK):
+            chunk = rows[i:i + _INSERT_CHUNK]
+            conn.execute(_INSERT_SQL, chunk)
+            hashes = sorted({r["pgn_sha1"] for r in chunk})
+            id_by_sha1 = {h: int(x) for x, h in conn.execute(_IDS_SQL, {"hashes": hashes})}
+            ids.extend(id_by_sha1[r["pgn_sha1"]] for r in chunk)
     return ids
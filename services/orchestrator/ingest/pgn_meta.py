@@ -0,0 +1,67 @@
+"""
+PGN metadata shared by the chess.com and Lichess fetchers.
+
+Headers come from chess.pgn.read_headers and the ply count from a regex over
+the movetext, so no game tree is built and no move is validated — fetchers
+only need a summary of each game, and archives hold thousands of them.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+from typing import Dict, Optional
+
+import chess.pgn
+
+# Movetext noise that is not mainline: {comments}, ; line comments, $NAGs
+_COMMENT_RE = re.compile(r"\{[^}]*\}|;[^\n]*|\$\d+")
+# An innermost (variation) — stripped repeatedly to handle nesting
+_VARIATION_RE = re.compile(r"\([^()]*\)")
+# One SAN move, standing after whitespace or a move number's dot
+_SAN_RE = re.compile(
+    r"(?<![^\s.])(?:[KQRBN]?[a-h]?[1-8]?x?[a-h][1-8](?:=?[QRBN])?|O-O(?:-O)?|0-0(?:-0)?)[+#]?[!?]*(?=\s|$|[)(])"
+)
+
+
+def count_plies(movetext: str) -> int:
+    """Number of mainline moves in PGN movetext (headers already removed)."""
+    text = _COMMENT_RE.sub(" ", movetext)
+    while True:
+        stripped = _VARIATION_RE.sub(" ", text)
+        if stripped == text:
+            break
+        text = stripped
+    return len(_SAN_RE.findall(text))
+
+
+def _movetext(pgn: str) -> str:
+    """Everything after the header block."""
+    lines = pgn.lstrip().splitlines()
+    i = 0
+    while i < len(lines) and lines[i].lstrip().startswith("["):
+        i += 1
+    return "\n".join(lines[i:])
+
+
+def normalize_metadata(pgn: str) -> Dict:
+    """Parse PGN headers into a consistent shape (ply_count None if no game)."""
+    headers: Optional[chess.pgn.Headers] = chess.pgn.read_headers(io.StringIO(pgn))
+    if headers is not None:
+        # read_game fills missing Seven Tag Roster tags ("?"); match it
+        full = chess.pgn.Headers()
+        full.update(headers)
+        headers = full
+    meta = {
+        "white": headers.get("White") if headers else None,
+        "black": headers.get("Black") if headers else None,
+        "date": headers.get("Date") if headers else None,
+        "event": headers.get("Event") if headers else None,
+        "result": headers.get("Result") if headers else None,
+        "eco": headers.get("ECO") if headers else None,
+        "site": headers.get("Site") if headers else None,
+        "ply_count": None,
+    }
+    if headers is not None:
+        meta["ply_count"] = count_plies(_movetext(pgn))
+    return meta
@@ -10,9 +10,10 @@ Two backends, one output shape:
   decoding the audio.
 * ``local`` is the zero-cost fallback: Windows SAPI via PowerShell (reliable
   for long unattended batches, unlike pyttsx3, which wedges partway through a
-  queued batch on SAPI5), or pyttsx3 one-clip-at-a-time elsewhere. Word times
-  are estimated proportionally from character offsets, so the rest of the
-  pipeline behaves identically.
+  queued batch on SAPI5), or pyttsx3 elsewhere — a fresh engine per clip,
+  several clips at once in worker processes. Word times are estimated
+  proportionally from character offsets, so the rest of the pipeline behaves
+  identically.
 
 Manifest written to ``audio_manifest.json``::
 
@@ -137,6 +138,19 @@ def _estimate_words(text: str, duration_ms: int) -> List[Dict[str, Any]]:
     return words
 
 
+def _write_silence(path: Path, duration_ms: int) -> None:
+    """Silent placeholder WAV, the format pydub's AudioSegment.silent exports
+    (16-bit mono, 11025 Hz) — written with `wave`, no pydub import per clip."""
+    import wave
+
+    frames = int(11025 * duration_ms / 1000.0)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(11025)
+        wav.writeframes(bytes(frames * 2))
+
+
 # --------------------------------------------------------------------------
 # ElevenLabs
 # --------------------------------------------------------------------------
@@ -290,8 +304,6 @@ def _measure_wavs(
     """Read durations from generated WAVs, filling gaps with silence."""
     import wave
 
-    from pydub import AudioSegment
-
     clips: Dict[str, Dict[str, Any]] = {}
     for item in lines:
         path = out_dir / f"{item['id']}.wav"
@@ -302,10 +314,20 @@ def _measure_wavs(
                 duration_ms = int(wav.getnframes() / float(wav.getframerate()) * 1000)
         except Exception:
             duration_ms = 0
+        if duration_ms <= 0 and path.exists():
+            # Float or extensible WAVs that `wave` rejects: still a header
+            # read, not a decode — and not a real clip to overwrite.
+            try:
+                import soundfile as sf  # type: ignore
+
+                info = sf.info(str(path))
+                duration_ms = int(info.frames * 1000 / info.samplerate)
+            except Exception:
+                duration_ms = 0
 
         if duration_ms <= 0:
             duration_ms = max(1200, int(len(item["text"]) / 14.0 * 1000))
-            AudioSegment.silent(duration=duration_ms).export(path, format="wav")
+            _write_silence(path, duration_ms)
             print(f"[tts] placeholder for {item['id']} ({duration_ms} ms)")
 
         clips[item["id"]] = {
@@ -319,27 +341,28 @@ def _measure_wavs(
 def _pyttsx3_synthesize(
     lines: Sequence[Dict[str, str]], out_dir: Path
 ) -> Dict[str, Dict[str, Any]]:
-    """One clip per engine lifecycle — slower, but it does not wedge."""
-    import pyttsx3
+    """Clips synthesize in parallel worker processes, one engine per clip.
 
-    total = len(lines)
-    for idx, item in enumerate(lines, start=1):
-        engine = pyttsx3.init()
-        engine.setProperty("rate", 170)
-        engine.setProperty("volume", 0.95)
-        try:
-            for v in engine.getProperty("voices") or []:
-                name = (getattr(v, "name", "") or "").lower()
-                if any(k in name for k in ("zira", "female", "hazel", "eva", "samantha")):
-                    engine.setProperty("voice", v.id)
-                    break
-        except Exception:
-            pass
-        engine.save_to_file(item["text"], str(out_dir / f"{item['id']}.wav"))
-        engine.runAndWait()
-        engine.stop()
-        if idx % 10 == 0 or idx == total:
-            print(f"[tts] local {idx}/{total}")
+    One clip per engine lifecycle (see tts_worker) — slower than reusing an
+    engine, but it does not wedge; the worker processes win the time back.
+    """
+    import multiprocessing as mp
+
+    # Pool workers unpickle synth_one by module name, so this directory has
+    # to be importable in them too (spawn hands sys.path to the children).
+    here = str(Path(__file__).resolve().parent)
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    import tts_worker
+
+    jobs = [(item["id"], item["text"], str(out_dir / f"{item['id']}.wav")) for item in lines]
+    total = len(jobs)
+    if jobs:
+        workers = max(1, min(int(os.getenv("TTS_LOCAL_WORKERS", "4")), total))
+        with mp.Pool(processes=workers) as pool:
+            for idx, _ in enumerate(pool.imap_unordered(tts_worker.synth_one, jobs), start=1):
+                if idx % 10 == 0 or idx == total:
+                    print(f"[tts] local {idx}/{total}")
     return _measure_wavs(lines, out_dir)
 
 
@@ -2034,14 +2057,12 @@ def _check_offvoice_beats(
 
 def _silent_synthesize(lines: Sequence[Dict[str, str]], out_dir: Path) -> Dict[str, Dict[str, Any]]:
     """Silent placeholders sized to the text — for fast structural test renders."""
-    from pydub import AudioSegment
-
     clips: Dict[str, Dict[str, Any]] = {}
     for item in lines:
         # ~14 characters per second is close to natural narration pace.
         duration_ms = max(1200, int(len(item["text"]) / 14.0 * 1000))
         path = out_dir / f"{item['id']}.wav"
-        AudioSegment.silent(duration=duration_ms).export(path, format="wav")
+        _write_silence(path, duration_ms)
         clips[item["id"]] = {
             "file": path.name,
             "durationMs": duration_ms,
@@ -0,0 +1,42 @@
+"""Worker processes for the pyttsx3 fallback in ``tts.py``.
+
+Clips synthesize in several processes at once, but every clip still gets its
+own engine lifecycle — init, one ``save_to_file`` + ``runAndWait()``, stop.
+Reusing an engine across clips is what wedges SAPI5 partway through a batch;
+a fresh engine per clip is slower, but it does not wedge.
+
+Lives in its own module so the pool can pickle the function by name.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Tuple
+
+
+def _new_engine() -> Any:
+    import pyttsx3
+
+    engine = pyttsx3.init()
+    engine.setProperty("rate", 170)
+    engine.setProperty("volume", 0.95)
+    try:
+        for v in engine.getProperty("voices") or []:
+            name = (getattr(v, "name", "") or "").lower()
+            if any(k in name for k in ("zira", "female", "hazel", "eva", "samantha")):
+                engine.setProperty("voice", v.id)
+                break
+    except Exception:
+        pass
+    return engine
+
+
+def synth_one(job: Tuple[str, str, str]) -> str:
+    """Synthesize one ``(id, text, wav_path)`` job on a fresh engine; returns the id."""
+    clip_id, text, path = job
+    engine = _new_engine()
+    try:
+        engine.save_to_file(text, path)
+        engine.runAndWait()
+    finally:
+        engine.stop()
+    return clip_id